@@ -2,27 +2,112 @@
 from __future__ import annotations
 
 import logging
+import time
+from typing import Any
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+import voluptuous as vol
 
-from .const import DOMAIN
-from .coordinator import SensorCommunityCoordinator
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_CIRCUIT_FAILURE_RATIO,
+    CONF_CIRCUIT_MIN_REQUESTS,
+    CONF_CIRCUIT_OPEN_DURATION,
+    CONF_MAX_IN_FLIGHT,
+    CONF_SENDER_WORKERS,
+    CONF_SENSOR_ID,
+    DATA_CONFIG,
+    DATA_OUTBOX,
+    DATA_RATE_LIMITER,
+    DATA_SCHEDULER,
+    DATA_SENDER,
+    DATA_SNAPSHOT,
+    DATA_TRANSPORT,
+    DEFAULT_CIRCUIT_FAILURE_RATIO,
+    DEFAULT_CIRCUIT_MIN_REQUESTS,
+    DEFAULT_CIRCUIT_OPEN_DURATION,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_SENDER_WORKERS,
+    DOMAIN,
+    ISSUE_CIRCUIT_OPEN,
+)
+from .coordinator import SensorCommunityCoordinator, station_configs
+from .openmetrics import OpenMetricsRenderer, SensorCommunityMetricsView
+from .outbox import SensorCommunityOutbox
+from .rate_limit import UploadRateLimiter
+from .scheduler import UploadScheduler
+from .sender import UploadSender
+from .snapshot import StateSnapshotCache
+from .transport import SensorCommunityTransport
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+# Optional domain-wide tuning shared by all config entries
+DOMAIN_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            CONF_CIRCUIT_FAILURE_RATIO, default=DEFAULT_CIRCUIT_FAILURE_RATIO
+        ): vol.All(vol.Coerce(float), vol.Range(min=0.05, max=1.0)),
+        vol.Optional(
+            CONF_CIRCUIT_MIN_REQUESTS, default=DEFAULT_CIRCUIT_MIN_REQUESTS
+        ): cv.positive_int,
+        vol.Optional(
+            CONF_CIRCUIT_OPEN_DURATION, default=DEFAULT_CIRCUIT_OPEN_DURATION
+        ): cv.positive_int,
+        vol.Optional(CONF_MAX_IN_FLIGHT, default=DEFAULT_MAX_IN_FLIGHT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(CONF_SENDER_WORKERS, default=DEFAULT_SENDER_WORKERS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=200)
+        ),
+    }
+)
+
+CONFIG_SCHEMA = vol.Schema({DOMAIN: DOMAIN_SCHEMA}, extra=vol.ALLOW_EXTRA)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Store the domain-wide tuning options and serve the metrics endpoint."""
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][DATA_CONFIG] = config.get(DOMAIN) or DOMAIN_SCHEMA({})
+    hass.http.register_view(SensorCommunityMetricsView(OpenMetricsRenderer(hass)))
+
+    async def _async_close_transport(event: Event) -> None:
+        """Close the shared session when Home Assistant stops."""
+        transport: SensorCommunityTransport | None = hass.data[DOMAIN].get(
+            DATA_TRANSPORT
+        )
+        if transport is not None:
+            await transport.async_close()
+
+    # Registered once; entries come and go, but share one transport at a time
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_transport)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Sensor.Community from a config entry."""
+    started = time.monotonic()
     hass.data.setdefault(DOMAIN, {})
 
-    coordinator = SensorCommunityCoordinator(hass, entry)
-
-    # Perform initial data push
-    await coordinator.async_config_entry_first_refresh()
+    outbox = await _async_get_outbox(hass)
+    snapshot: StateSnapshotCache = hass.data[DOMAIN].setdefault(
+        DATA_SNAPSHOT, StateSnapshotCache(hass)
+    )
+    scheduler: UploadScheduler = hass.data[DOMAIN].setdefault(
+        DATA_SCHEDULER, UploadScheduler(hass)
+    )
+    sender = _async_acquire_sender(hass)
+    coordinator = SensorCommunityCoordinator(
+        hass, entry, sender, outbox, snapshot, scheduler
+    )
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -31,6 +116,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Register update listener for options changes
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
+    # Upload in the background so setup never waits on the API; every
+    # station uploads at its own phase within the interval
+    coordinator.async_schedule_first_upload()
+
+    coordinator.setup_duration = time.monotonic() - started
+    _LOGGER.debug(
+        "Set up %s with %d station(s) in %.3f seconds",
+        entry.title,
+        len(coordinator.stations),
+        coordinator.setup_duration,
+    )
+
     return True
 
 
@@ -39,6 +136,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         coordinator: SensorCommunityCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coordinator.async_shutdown()
+        await _async_release_sender(hass)
 
     return unload_ok
 
@@ -46,3 +144,70 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop queued readings when a config entry is removed."""
+    hass.data.setdefault(DOMAIN, {})
+    outbox = await _async_get_outbox(hass)
+    for station_config in station_configs({**entry.data, **entry.options}):
+        outbox.async_purge(station_config[CONF_SENSOR_ID])
+
+
+async def _async_get_outbox(hass: HomeAssistant) -> SensorCommunityOutbox:
+    """Return the shared outbox, loading it from storage on first use."""
+    outbox: SensorCommunityOutbox | None = hass.data[DOMAIN].get(DATA_OUTBOX)
+
+    if outbox is None:
+        outbox = SensorCommunityOutbox(hass)
+        await outbox.async_load()
+        # Another entry may have loaded it while we were waiting on storage
+        outbox = hass.data[DOMAIN].setdefault(DATA_OUTBOX, outbox)
+
+    return outbox
+
+
+@callback
+def _async_acquire_sender(hass: HomeAssistant) -> UploadSender:
+    """Return the shared sender and transport, creating them for the first entry."""
+    transport: SensorCommunityTransport | None = hass.data[DOMAIN].get(DATA_TRANSPORT)
+
+    if transport is None:
+        conf: dict[str, Any] = hass.data[DOMAIN].get(DATA_CONFIG) or DOMAIN_SCHEMA({})
+        transport = SensorCommunityTransport(
+            hass,
+            circuit_failure_ratio=conf[CONF_CIRCUIT_FAILURE_RATIO],
+            circuit_min_requests=conf[CONF_CIRCUIT_MIN_REQUESTS],
+            circuit_open_duration=conf[CONF_CIRCUIT_OPEN_DURATION],
+            max_in_flight=conf[CONF_MAX_IN_FLIGHT],
+        )
+        hass.data[DOMAIN][DATA_TRANSPORT] = transport
+
+        # The limiter outlives the transport, so a reload keeps its tokens
+        rate_limiter: UploadRateLimiter = hass.data[DOMAIN].setdefault(
+            DATA_RATE_LIMITER, UploadRateLimiter()
+        )
+        sender = UploadSender(
+            hass, transport, rate_limiter, workers=conf[CONF_SENDER_WORKERS]
+        )
+        sender.async_start()
+        hass.data[DOMAIN][DATA_SENDER] = sender
+
+    transport.acquire()
+    return hass.data[DOMAIN][DATA_SENDER]
+
+
+async def _async_release_sender(hass: HomeAssistant) -> None:
+    """Release the shared transport; stop sender and scheduler after the last entry."""
+    transport: SensorCommunityTransport | None = hass.data[DOMAIN].get(DATA_TRANSPORT)
+    if transport is None:
+        return
+
+    if transport.refs == 1:
+        hass.data[DOMAIN].pop(DATA_SENDER).async_stop()
+        if scheduler := hass.data[DOMAIN].pop(DATA_SCHEDULER, None):
+            scheduler.async_stop()
+
+    if await transport.async_release():
+        hass.data[DOMAIN].pop(DATA_TRANSPORT)
+        ir.async_delete_issue(hass, DOMAIN, ISSUE_CIRCUIT_OPEN)
@@ -0,0 +1,112 @@
+"""Adaptive upload interval for the Sensor.Community integration."""
+from __future__ import annotations
+
+import math
+
+from .const import ADAPTIVE_ALPHA
+from .units import (
+    MEASUREMENT_HUMIDITY,
+    MEASUREMENT_PM,
+    MEASUREMENT_PRESSURE,
+    MEASUREMENT_TEMPERATURE,
+)
+
+# Standard deviation, in the unit sent to the API, at which a measurement
+# counts as fully variable and is uploaded at the shortest interval
+VARIABILITY_SCALES: dict[str, float] = {
+    MEASUREMENT_PM: 5.0,  # µg/m³
+    MEASUREMENT_TEMPERATURE: 0.5,  # °C
+    MEASUREMENT_HUMIDITY: 3.0,  # %
+    MEASUREMENT_PRESSURE: 50.0,  # Pa
+}
+
+
+class EwStats:
+    """Exponentially weighted mean and variance, updated in O(1).
+
+    Recent samples weigh more, so the variance follows changes in the
+    signal instead of averaging over the whole history.
+    """
+
+    __slots__ = ("alpha", "mean", "variance", "count")
+
+    def __init__(self, alpha: float = ADAPTIVE_ALPHA) -> None:
+        """Initialize the statistics."""
+        self.alpha = alpha
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return
+
+        diff = value - self.mean
+        increment = self.alpha * diff
+        self.mean += increment
+        self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+
+    @property
+    def stddev(self) -> float:
+        """Return the standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class AdaptiveInterval:
+    """Choose an upload interval between two bounds from signal variability.
+
+    Each field is sampled once per upload, so the statistics follow time
+    rather than how often a source reports, and is scored by its standard
+    deviation relative to the scale of its measurement. The most variable field decides: a score of 0 uploads
+    at the longest interval, a score of 1 or more at the shortest.
+    """
+
+    __slots__ = ("min_interval", "max_interval", "_stats", "_scales")
+
+    def __init__(self, min_interval: float, max_interval: float) -> None:
+        """Initialize the interval."""
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self._stats: dict[str, EwStats] = {}
+        self._scales: dict[str, float] = {}
+
+    def add(self, field: str, measurement: str, value: float) -> None:
+        """Add a converted sample of a field."""
+        stats = self._stats.get(field)
+        if stats is None:
+            stats = self._stats[field] = EwStats()
+            self._scales[field] = VARIABILITY_SCALES[measurement]
+        stats.add(value)
+
+    @property
+    def score(self) -> float:
+        """Return the variability of the most variable field."""
+        return max(
+            (stats.stddev / self._scales[field] for field, stats in self._stats.items()),
+            default=0.0,
+        )
+
+    @property
+    def interval(self) -> float:
+        """Return the upload interval for the current variability."""
+        span = self.max_interval - self.min_interval
+        return self.max_interval - span * min(self.score, 1.0)
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the statistics for diagnostics."""
+        return {
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "interval": round(self.interval, 1),
+            "fields": {
+                field: {
+                    "samples": stats.count,
+                    "mean": round(stats.mean, 3),
+                    "stddev": round(stats.stddev, 3),
+                }
+                for field, stats in self._stats.items()
+            },
+        }
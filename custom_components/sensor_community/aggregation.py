@@ -0,0 +1,68 @@
+"""Interval aggregation of source values for the Sensor.Community integration."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Sequence
+from statistics import fmean, median
+
+from .const import (
+    AGGREGATION_MEAN,
+    AGGREGATION_MEDIAN,
+    AGGREGATION_TRIM_FRACTION,
+    AGGREGATION_TRIMMED_MEAN,
+)
+
+
+class RingBuffer:
+    """Fixed capacity buffer of floats backed by a contiguous array.
+
+    Appending is O(1) and never allocates; once full, the oldest sample is
+    overwritten, so memory stays bounded however fast the source updates.
+    """
+
+    __slots__ = ("_data", "_capacity", "_next", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the buffer."""
+        self._data = array("d", bytes(8 * capacity))
+        self._capacity = capacity
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered samples."""
+        return self._size
+
+    def append(self, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+    def values(self) -> Sequence[float]:
+        """Return the buffered samples in no particular order."""
+        if self._size < self._capacity:
+            return self._data[: self._size]
+        return self._data
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._next = 0
+        self._size = 0
+
+
+def trimmed_mean(values: Sequence[float]) -> float:
+    """Return the mean after dropping the lowest and highest samples."""
+    ordered = sorted(values)
+    trim = int(len(ordered) * AGGREGATION_TRIM_FRACTION)
+    if trim:
+        ordered = ordered[trim:-trim]
+    return fmean(ordered)
+
+
+AGGREGATORS: dict[str, Callable[[Sequence[float]], float]] = {
+    AGGREGATION_MEAN: fmean,
+    AGGREGATION_MEDIAN: median,
+    AGGREGATION_TRIMMED_MEAN: trimmed_mean,
+}
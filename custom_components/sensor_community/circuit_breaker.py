@@ -0,0 +1,142 @@
+"""Circuit breaker for Sensor.Community API endpoints."""
+from __future__ import annotations
+
+from collections import deque
+import logging
+import time
+
+from .const import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    DEFAULT_CIRCUIT_FAILURE_RATIO,
+    DEFAULT_CIRCUIT_MIN_REQUESTS,
+    DEFAULT_CIRCUIT_OPEN_DURATION,
+    DEFAULT_CIRCUIT_WINDOW,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Track the health of one endpoint and stop requests while it is down.
+
+    The breaker keeps the outcomes of the most recent requests and opens
+    once the share of failures reaches the configured ratio. While open,
+    requests are refused without touching the network. After the open
+    duration a single probe is let through; its outcome closes the breaker
+    again or restarts the open period.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_ratio: float = DEFAULT_CIRCUIT_FAILURE_RATIO,
+        min_requests: int = DEFAULT_CIRCUIT_MIN_REQUESTS,
+        window: int = DEFAULT_CIRCUIT_WINDOW,
+        open_duration: float = DEFAULT_CIRCUIT_OPEN_DURATION,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.endpoint = endpoint
+        self.failure_ratio = failure_ratio
+        self.min_requests = min(min_requests, window)
+        self.open_duration = open_duration
+
+        self.state = CIRCUIT_CLOSED
+        self.opened_at: float | None = None
+        # When the breaker last left the closed state, across probes
+        self.tripped_at: float | None = None
+        self.trip_count = 0
+        self.rejected_count = 0
+
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._failures = 0
+        self._probe_in_flight = False
+
+    @property
+    def failure_rate(self) -> float:
+        """Return the failure ratio over the current window."""
+        if not self._outcomes:
+            return 0.0
+        return self._failures / len(self._outcomes)
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self.state == CIRCUIT_CLOSED:
+            return True
+
+        if (
+            self.state == CIRCUIT_OPEN
+            and self.opened_at is not None
+            and time.monotonic() - self.opened_at >= self.open_duration
+        ):
+            self.state = CIRCUIT_HALF_OPEN
+            _LOGGER.info("Sending probe request to %s", self.endpoint)
+
+        if self.state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        self.rejected_count += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a request that reached a responsive endpoint."""
+        if self.state != CIRCUIT_CLOSED:
+            _LOGGER.warning(
+                "Connection to %s restored, resuming uploads", self.endpoint
+            )
+            self._reset()
+            return
+
+        self._record(False)
+
+    def record_failure(self) -> None:
+        """Record a request that failed because the endpoint is unhealthy."""
+        if self.state != CIRCUIT_CLOSED:
+            self._open()
+            return
+
+        self._record(True)
+        if (
+            len(self._outcomes) >= self.min_requests
+            and self.failure_rate >= self.failure_ratio
+        ):
+            _LOGGER.warning(
+                "%.0f%% of recent requests to %s failed, pausing uploads for %d seconds",
+                self.failure_rate * 100,
+                self.endpoint,
+                self.open_duration,
+            )
+            self._open()
+
+    def release_probe(self) -> None:
+        """Release a probe whose request ended without an outcome."""
+        self._probe_in_flight = False
+
+    def _record(self, failed: bool) -> None:
+        """Add an outcome to the sliding window in constant time."""
+        if len(self._outcomes) == self._outcomes.maxlen and self._outcomes[0]:
+            self._failures -= 1
+        self._outcomes.append(failed)
+        if failed:
+            self._failures += 1
+
+    def _open(self) -> None:
+        """Open the breaker and start the open period."""
+        now = time.monotonic()
+        if self.state == CIRCUIT_CLOSED:
+            self.trip_count += 1
+            self.tripped_at = now
+        self.state = CIRCUIT_OPEN
+        self.opened_at = now
+        self._probe_in_flight = False
+
+    def _reset(self) -> None:
+        """Close the breaker and forget previous outcomes."""
+        self.state = CIRCUIT_CLOSED
+        self.opened_at = None
+        self.tripped_at = None
+        self._probe_in_flight = False
+        self._outcomes.clear()
+        self._failures = 0
@@ -13,17 +13,34 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 
 from .const import (
+    AGGREGATION_MODES,
     ALL_SENSORS,
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_AGGREGATION,
     CONF_DEBUG_MODE,
+    CONF_ENTRY_TYPE,
+    CONF_HOLD_MAX_AGE,
+    CONF_OUTBOX_MAX_AGE,
+    CONF_MAX_UPDATE_INTERVAL,
     CONF_SENSOR_HUMIDITY,
     CONF_SENSOR_ID,
     CONF_SENSOR_PM10,
     CONF_SENSOR_PM25,
     CONF_SENSOR_PRESSURE,
     CONF_SENSOR_TEMPERATURE,
+    CONF_STATIONS,
     CONF_UPDATE_INTERVAL,
+    DEFAULT_AGGREGATION,
+    DEFAULT_HOLD_MAX_AGE,
+    DEFAULT_OUTBOX_MAX_AGE,
+    DEFAULT_MAX_UPDATE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    ENTRY_TYPE_FLEET,
+    ENTRY_TYPE_STATION,
+    MAX_HOLD_MAX_AGE,
+    MAX_OUTBOX_MAX_AGE,
+    MAX_UPDATE_INTERVAL,
     MIN_UPDATE_INTERVAL,
 )
 
@@ -31,12 +48,112 @@ _LOGGER = logging.getLogger(__name__)
 
 SENSOR_ID_PATTERN = re.compile(r"^[a-zA-Z0-9]+-[a-zA-Z0-9]+$")
 
+AGGREGATION_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=AGGREGATION_MODES,
+        translation_key=CONF_AGGREGATION,
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
+)
+
+MAX_INTERVAL_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=MIN_UPDATE_INTERVAL,
+        max=MAX_UPDATE_INTERVAL,
+        step=10,
+        unit_of_measurement="seconds",
+        mode=selector.NumberSelectorMode.BOX,
+    )
+)
+
+HOLD_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0,
+        max=MAX_HOLD_MAX_AGE,
+        step=5,
+        unit_of_measurement="seconds",
+        mode=selector.NumberSelectorMode.BOX,
+    )
+)
+
+OUTBOX_AGE_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0,
+        max=MAX_OUTBOX_MAX_AGE,
+        step=30,
+        unit_of_measurement="seconds",
+        mode=selector.NumberSelectorMode.BOX,
+    )
+)
+
+STATIONS_SELECTOR = selector.ObjectSelector()
+
+STATION_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_SENSOR_ID): vol.All(str, vol.Strip),
+        **{vol.Optional(field): vol.Any(None, str) for field in ALL_SENSORS},
+    }
+)
+
 
 def validate_sensor_id(sensor_id: str) -> bool:
     """Validate the sensor ID format."""
     return bool(SENSOR_ID_PATTERN.match(sensor_id))
 
 
+def validate_stations(
+    stations: Any, configured: set[str]
+) -> tuple[list[dict[str, str]], str | None]:
+    """Validate the station list of a fleet entry.
+
+    Returns the cleaned stations and an error key, if any.
+    """
+    if not isinstance(stations, list) or not stations:
+        return [], "invalid_stations"
+
+    cleaned: list[dict[str, str]] = []
+    seen: set[str] = set()
+    for station in stations:
+        try:
+            station = STATION_SCHEMA(station)
+        except vol.Invalid:
+            return [], "invalid_stations"
+
+        sensor_id = station[CONF_SENSOR_ID]
+        if not validate_sensor_id(sensor_id):
+            return [], "invalid_sensor_id"
+        if sensor_id in seen or sensor_id in configured:
+            return [], "duplicate_sensor_id"
+        if not any(station.get(field) for field in ALL_SENSORS):
+            return [], "no_sensor_configured"
+
+        seen.add(sensor_id)
+        cleaned.append(
+            {CONF_SENSOR_ID: sensor_id}
+            | {field: station[field] for field in ALL_SENSORS if station.get(field)}
+        )
+
+    return cleaned, None
+
+
+def configured_sensor_ids(
+    entries: list[config_entries.ConfigEntry], exclude: str | None = None
+) -> set[str]:
+    """Return the sensor IDs used by existing entries."""
+    sensor_ids: set[str] = set()
+    for entry in entries:
+        if entry.entry_id == exclude:
+            continue
+        config = {**entry.data, **entry.options}
+        if config.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FLEET:
+            sensor_ids.update(
+                station[CONF_SENSOR_ID] for station in config.get(CONF_STATIONS, [])
+            )
+        elif CONF_SENSOR_ID in config:
+            sensor_ids.add(config[CONF_SENSOR_ID])
+    return sensor_ids
+
+
 class SensorCommunityConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Sensor.Community."""
 
@@ -49,7 +166,16 @@ class SensorCommunityConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step - sensor ID configuration."""
+        """Handle the initial step - choose a single station or a fleet."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=[ENTRY_TYPE_STATION, ENTRY_TYPE_FLEET],
+        )
+
+    async def async_step_station(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the sensor ID configuration of a single station."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -61,12 +187,14 @@ class SensorCommunityConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 # Check if already configured
                 await self.async_set_unique_id(sensor_id)
                 self._abort_if_unique_id_configured()
+                if sensor_id in configured_sensor_ids(self._async_current_entries()):
+                    return self.async_abort(reason="already_configured")
 
                 self._data[CONF_SENSOR_ID] = sensor_id
                 return await self.async_step_sensors()
 
         return self.async_show_form(
-            step_id="user",
+            step_id="station",
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_SENSOR_ID): str,
@@ -121,6 +249,34 @@ class SensorCommunityConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_fleet(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the station list of a fleet."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            stations, error = validate_stations(
+                user_input.get(CONF_STATIONS),
+                configured_sensor_ids(self._async_current_entries()),
+            )
+            if error:
+                errors["base"] = error
+            else:
+                self._data[CONF_ENTRY_TYPE] = ENTRY_TYPE_FLEET
+                self._data[CONF_STATIONS] = stations
+                return await self.async_step_options()
+
+        return self.async_show_form(
+            step_id="fleet",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_STATIONS): STATIONS_SELECTOR,
+                }
+            ),
+            errors=errors,
+        )
+
     async def async_step_options(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -130,12 +286,29 @@ class SensorCommunityConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
             )
             self._data[CONF_DEBUG_MODE] = user_input.get(CONF_DEBUG_MODE, False)
-
-            return self.async_create_entry(
-                title=f"Sensor.Community ({self._data[CONF_SENSOR_ID]})",
-                data=self._data,
+            self._data[CONF_AGGREGATION] = user_input.get(
+                CONF_AGGREGATION, DEFAULT_AGGREGATION
+            )
+            self._data[CONF_ADAPTIVE_INTERVAL] = user_input.get(
+                CONF_ADAPTIVE_INTERVAL, False
+            )
+            self._data[CONF_MAX_UPDATE_INTERVAL] = user_input.get(
+                CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+            )
+            self._data[CONF_HOLD_MAX_AGE] = user_input.get(
+                CONF_HOLD_MAX_AGE, DEFAULT_HOLD_MAX_AGE
+            )
+            self._data[CONF_OUTBOX_MAX_AGE] = user_input.get(
+                CONF_OUTBOX_MAX_AGE, DEFAULT_OUTBOX_MAX_AGE
             )
 
+            if self._data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FLEET:
+                title = f"Sensor.Community fleet ({len(self._data[CONF_STATIONS])} stations)"
+            else:
+                title = f"Sensor.Community ({self._data[CONF_SENSOR_ID]})"
+
+            return self.async_create_entry(title=title, data=self._data)
+
         return self.async_show_form(
             step_id="options",
             data_schema=vol.Schema(
@@ -152,6 +325,19 @@ class SensorCommunityConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                             mode=selector.NumberSelectorMode.BOX,
                         )
                     ),
+                    vol.Optional(
+                        CONF_AGGREGATION, default=DEFAULT_AGGREGATION
+                    ): AGGREGATION_SELECTOR,
+                    vol.Optional(CONF_ADAPTIVE_INTERVAL, default=False): bool,
+                    vol.Optional(
+                        CONF_MAX_UPDATE_INTERVAL, default=DEFAULT_MAX_UPDATE_INTERVAL
+                    ): MAX_INTERVAL_SELECTOR,
+                    vol.Optional(
+                        CONF_HOLD_MAX_AGE, default=DEFAULT_HOLD_MAX_AGE
+                    ): HOLD_SELECTOR,
+                    vol.Optional(
+                        CONF_OUTBOX_MAX_AGE, default=DEFAULT_OUTBOX_MAX_AGE
+                    ): OUTBOX_AGE_SELECTOR,
                     vol.Optional(CONF_DEBUG_MODE, default=False): bool,
                 }
             ),
@@ -173,14 +359,26 @@ class SensorCommunityOptionsFlow(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle options flow."""
-        if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
-
         # Get current values - merge data and options
         current_data = {**self.config_entry.data, **self.config_entry.options}
 
+        if current_data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FLEET:
+            return await self.async_step_fleet(user_input)
+
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
         current_interval = current_data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
         current_debug = current_data.get(CONF_DEBUG_MODE, False)
+        current_aggregation = current_data.get(CONF_AGGREGATION, DEFAULT_AGGREGATION)
+        current_adaptive = current_data.get(CONF_ADAPTIVE_INTERVAL, False)
+        current_max_interval = current_data.get(
+            CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+        )
+        current_hold = current_data.get(CONF_HOLD_MAX_AGE, DEFAULT_HOLD_MAX_AGE)
+        current_outbox_age = current_data.get(
+            CONF_OUTBOX_MAX_AGE, DEFAULT_OUTBOX_MAX_AGE
+        )
 
         # Create entity selector
         entity_selector = selector.EntitySelector(
@@ -220,7 +418,102 @@ class SensorCommunityOptionsFlow(config_entries.OptionsFlow):
                             mode=selector.NumberSelectorMode.BOX,
                         )
                     ),
+                    vol.Optional(
+                        CONF_AGGREGATION, default=current_aggregation
+                    ): AGGREGATION_SELECTOR,
+                    vol.Optional(
+                        CONF_ADAPTIVE_INTERVAL, default=current_adaptive
+                    ): bool,
+                    vol.Optional(
+                        CONF_MAX_UPDATE_INTERVAL, default=current_max_interval
+                    ): MAX_INTERVAL_SELECTOR,
+                    vol.Optional(
+                        CONF_HOLD_MAX_AGE, default=current_hold
+                    ): HOLD_SELECTOR,
+                    vol.Optional(
+                        CONF_OUTBOX_MAX_AGE, default=current_outbox_age
+                    ): OUTBOX_AGE_SELECTOR,
                     vol.Optional(CONF_DEBUG_MODE, default=current_debug): bool,
                 }
             ),
         )
+
+    async def async_step_fleet(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle options of a fleet entry."""
+        errors: dict[str, str] = {}
+        current_data = {**self.config_entry.data, **self.config_entry.options}
+
+        if user_input is not None:
+            stations, error = validate_stations(
+                user_input.get(CONF_STATIONS),
+                configured_sensor_ids(
+                    self.hass.config_entries.async_entries(DOMAIN),
+                    exclude=self.config_entry.entry_id,
+                ),
+            )
+            if error:
+                errors["base"] = error
+            else:
+                return self.async_create_entry(
+                    title="", data={**user_input, CONF_STATIONS: stations}
+                )
+
+        return self.async_show_form(
+            step_id="fleet",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_STATIONS,
+                        default=current_data.get(CONF_STATIONS, []),
+                    ): STATIONS_SELECTOR,
+                    vol.Optional(
+                        CONF_UPDATE_INTERVAL,
+                        default=current_data.get(
+                            CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=MIN_UPDATE_INTERVAL,
+                            max=600,
+                            step=10,
+                            unit_of_measurement="seconds",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_AGGREGATION,
+                        default=current_data.get(CONF_AGGREGATION, DEFAULT_AGGREGATION),
+                    ): AGGREGATION_SELECTOR,
+                    vol.Optional(
+                        CONF_ADAPTIVE_INTERVAL,
+                        default=current_data.get(CONF_ADAPTIVE_INTERVAL, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MAX_UPDATE_INTERVAL,
+                        default=current_data.get(
+                            CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+                        ),
+                    ): MAX_INTERVAL_SELECTOR,
+                    vol.Optional(
+                        CONF_HOLD_MAX_AGE,
+    CONF_OUTBOX_MAX_AGE,
+                        default=current_data.get(
+                            CONF_HOLD_MAX_AGE, DEFAULT_HOLD_MAX_AGE
+                        ),
+                    ): HOLD_SELECTOR,
+                    vol.Optional(
+                        CONF_OUTBOX_MAX_AGE,
+                        default=current_data.get(
+                            CONF_OUTBOX_MAX_AGE, DEFAULT_OUTBOX_MAX_AGE
+                        ),
+                    ): OUTBOX_AGE_SELECTOR,
+                    vol.Optional(
+                        CONF_DEBUG_MODE,
+                        default=current_data.get(CONF_DEBUG_MODE, False),
+                    ): bool,
+                }
+            ),
+            errors=errors,
+        )
@@ -4,16 +4,129 @@ DOMAIN = "sensor_community"
 
 # API Configuration
 API_URL = "http://api.sensor.community/v1/push-sensor-data/"
+METRICS_URL = f"/api/{DOMAIN}/metrics"
 SOFTWARE_TYPE = "HomeAssistant-SensorCommunity"
 
 # Update intervals
 DEFAULT_UPDATE_INTERVAL = 150  # seconds (2.5 minutes as recommended by API)
 MIN_UPDATE_INTERVAL = 60  # minimum 1 minute
+DEFAULT_MAX_UPDATE_INTERVAL = 600  # longest interval in adaptive mode
+MAX_UPDATE_INTERVAL = 3600
+ADAPTIVE_ALPHA = 0.1  # weight of a new sample in the variability statistics
+ADAPTIVE_RESCHEDULE_RATIO = 0.1  # interval change that moves the next upload
+DEFAULT_HOLD_MAX_AGE = 0  # seconds a last good value is held, 0 disables holding
+MAX_HOLD_MAX_AGE = 600
+DEFAULT_OUTBOX_MAX_AGE = 300  # seconds a failed reading may be replayed, 0 disables
+MAX_OUTBOX_MAX_AGE = 1800
+
+# Shared HTTP transport
+HTTP_POOL_LIMIT = 100  # total pooled connections across all entries
+HTTP_POOL_LIMIT_PER_HOST = 20  # connections per API host
+HTTP_DNS_CACHE_TTL = 300  # seconds
+HTTP_KEEPALIVE_TIMEOUT = 60  # seconds
+HTTP_TIMEOUT = 30  # seconds per request attempt
+
+# Retries for transient upload failures
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2  # seconds, doubled per attempt
+RETRY_MAX_DELAY = 30  # seconds, cap on the backoff window
+RETRY_AFTER_MAX = 60  # seconds, longer Retry-After values are not waited for
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Client-side rate limit per sensor ID and pin
+RATE_LIMIT_PERIOD = MIN_UPDATE_INTERVAL  # seconds per token
+RATE_LIMIT_BURST = 2  # pushes allowed back to back, e.g. a manual refresh
+
+# Aggregation of source values between uploads
+AGGREGATION_NONE = "none"  # send the value at upload time
+AGGREGATION_MEAN = "mean"
+AGGREGATION_MEDIAN = "median"
+AGGREGATION_TRIMMED_MEAN = "trimmed_mean"
+AGGREGATION_MODES = [
+    AGGREGATION_NONE,
+    AGGREGATION_MEAN,
+    AGGREGATION_MEDIAN,
+    AGGREGATION_TRIMMED_MEAN,
+]
+DEFAULT_AGGREGATION = AGGREGATION_NONE
+AGGREGATION_BUFFER_SIZE = 256  # samples kept per field and interval
+AGGREGATION_TRIM_FRACTION = 0.1  # share dropped at each end for the trimmed mean
+
+# Circuit breaker shared by all stations, per API endpoint
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+CIRCUIT_STATES = (CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN)
+DEFAULT_CIRCUIT_FAILURE_RATIO = 0.5
+DEFAULT_CIRCUIT_MIN_REQUESTS = 10  # outcomes needed before the ratio is evaluated
+DEFAULT_CIRCUIT_WINDOW = 50  # most recent outcomes considered
+DEFAULT_CIRCUIT_OPEN_DURATION = 120  # seconds before a half-open probe
+
+# Outbox for readings that could not be uploaded
+OUTBOX_STORAGE_KEY = f"{DOMAIN}.outbox"
+OUTBOX_STORAGE_VERSION = 1
+OUTBOX_MAX_ITEMS = 1000  # per sensor ID and pin, a bound in case of clock jumps
+OUTBOX_SAVE_DELAY = 30  # seconds, batches writes during an outage
+OUTBOX_DRAIN_BATCH = 20  # queued readings replayed ahead of a regular upload
+
+# Requests kept per station in debug mode
+DEBUG_REQUEST_LOG_SIZE = 50
+
+# Repeated errors of a station are summarized once per interval, in seconds
+LOG_SUMMARY_INTERVAL = 900
+
+# Repair issues for persistent failures
+ISSUE_SOURCES_UNAVAILABLE = "sources_unavailable"
+ISSUE_CLIENT_ERRORS = "client_errors"
+ISSUE_CIRCUIT_OPEN = "circuit_open"
+REPAIR_SOURCES_UNAVAILABLE_AFTER = 3600  # seconds
+REPAIR_CLIENT_ERROR_WINDOW = 20  # most recent pushes considered
+REPAIR_CLIENT_ERROR_MIN_PUSHES = 10  # pushes needed before the ratio is evaluated
+REPAIR_CLIENT_ERROR_RATIO = 0.8
+REPAIR_CIRCUIT_OPEN_AFTER = 1800  # seconds
+
+# Keys for shared objects stored in hass.data[DOMAIN]
+DATA_CONFIG = "config"
+DATA_OUTBOX = "outbox"
+DATA_RATE_LIMITER = "rate_limiter"
+DATA_SCHEDULER = "scheduler"
+DATA_SENDER = "sender"
+DATA_SNAPSHOT = "snapshot"
+DATA_TRANSPORT = "transport"
 
 # Configuration keys
 CONF_SENSOR_ID = "sensor_id"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_DEBUG_MODE = "debug_mode"
+CONF_AGGREGATION = "aggregation"
+CONF_ADAPTIVE_INTERVAL = "adaptive_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_HOLD_MAX_AGE = "hold_max_age"
+CONF_OUTBOX_MAX_AGE = "outbox_max_age"
+CONF_ENTRY_TYPE = "entry_type"
+CONF_STATIONS = "stations"
+
+# Entry types - a fleet entry drives many sensor IDs from one coordinator
+ENTRY_TYPE_STATION = "station"
+ENTRY_TYPE_FLEET = "fleet"
+
+# Upload scheduling
+SCHEDULER_COALESCE_WINDOW = 1.0  # seconds; wake-ups this close run together
+DEFAULT_MAX_IN_FLIGHT = 10  # concurrent API requests across all stations
+DEFAULT_SENDER_WORKERS = 20  # pushes in progress, including retry backoff
+SENDER_QUEUE_SIZE = 500  # payloads waiting for a worker before producers wait
+
+# Domain-wide tuning keys (configuration.yaml)
+CONF_CIRCUIT_FAILURE_RATIO = "circuit_failure_ratio"
+CONF_CIRCUIT_MIN_REQUESTS = "circuit_min_requests"
+CONF_CIRCUIT_OPEN_DURATION = "circuit_open_duration"
+CONF_MAX_IN_FLIGHT = "max_in_flight"
+CONF_SENDER_WORKERS = "sender_workers"
 
 # PM sensor entities
 CONF_SENSOR_PM25 = "sensor_pm25"
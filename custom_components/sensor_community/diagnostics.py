@@ -0,0 +1,75 @@
+"""Diagnostics support for the Sensor.Community integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_SENSOR_ID,
+    DATA_SCHEDULER,
+    DATA_SENDER,
+    DATA_TRANSPORT,
+    DOMAIN,
+)
+from .coordinator import SensorCommunityCoordinator
+from .scheduler import station_phase
+
+# The sensor ID identifies the station on the public map, so it is left out
+# of entry data, station status and request headers alike
+TO_REDACT = {CONF_SENSOR_ID, "X-Sensor"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: SensorCommunityCoordinator = hass.data[DOMAIN][entry.entry_id]
+    scheduler = hass.data[DOMAIN][DATA_SCHEDULER]
+    transport = hass.data[DOMAIN][DATA_TRANSPORT]
+    sender = hass.data[DOMAIN][DATA_SENDER]
+
+    diagnostics = {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "startup": {
+            "setup_duration": coordinator.setup_duration,
+            "first_upload_delay": coordinator.first_upload_delay,
+        },
+        "scheduler": {
+            **scheduler.as_dict(),
+            "requests_in_flight": transport.in_flight,
+            "max_in_flight": transport.max_in_flight,
+        },
+        "http": transport.tracer.as_dict(),
+        "sender": sender.as_dict(),
+        # A list rather than a mapping, so sensor IDs do not end up as keys
+        "stations": [
+            {
+                "upload_plan": station.plan.as_dict(),
+                "unit_conversions": station.converters.as_dict(),
+                "phase": station_phase(
+                    sensor_id, station.effective_interval.total_seconds()
+                ),
+                "adaptive_interval": (
+                    station.adaptive.as_dict() if station.adaptive else None
+                ),
+                "status": station.status_data(),
+                "rate_limits": sender.rate_limiter.as_dict(sensor_id),
+                "latency": station.metrics.as_dict(),
+                "partial_uploads": station.metrics.partial,
+                "skipped_uploads": station.metrics.skipped,
+                "held_values": station.metrics.held,
+                "requests": (
+                    station.request_log.as_list() if station.request_log else None
+                ),
+            }
+            for sensor_id, station in coordinator.stations.items()
+        ],
+    }
+
+    return async_redact_data(diagnostics, TO_REDACT)
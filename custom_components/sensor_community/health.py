@@ -0,0 +1,198 @@
+"""Repair issues for persistent upload failures of Sensor.Community stations."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Sequence
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    DOMAIN,
+    ISSUE_CIRCUIT_OPEN,
+    ISSUE_CLIENT_ERRORS,
+    ISSUE_SOURCES_UNAVAILABLE,
+    REPAIR_CIRCUIT_OPEN_AFTER,
+    REPAIR_CLIENT_ERROR_MIN_PUSHES,
+    REPAIR_CLIENT_ERROR_RATIO,
+    REPAIR_CLIENT_ERROR_WINDOW,
+    REPAIR_SOURCES_UNAVAILABLE_AFTER,
+)
+from .transport import PushResult
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StationHealth:
+    """Detect persistent failures of a station and raise repair issues.
+
+    Every upload cycle only updates counters: how long the mapped entities
+    have been unavailable, and the share of client errors over the most
+    recent pushes. The issue registry is only called when a condition
+    starts or stops holding, so a station failing for hours creates one
+    issue instead of rewriting it every cycle.
+    """
+
+    __slots__ = (
+        "hass",
+        "sensor_id",
+        "_outcomes",
+        "_client_errors",
+        "_unavailable_since",
+        "_unavailable",
+        "_last_error",
+        "_issues",
+    )
+
+    def __init__(self, hass: HomeAssistant, sensor_id: str) -> None:
+        """Initialize the detector."""
+        self.hass = hass
+        self.sensor_id = sensor_id
+        self._outcomes: deque[bool] = deque(maxlen=REPAIR_CLIENT_ERROR_WINDOW)
+        self._client_errors = 0
+        self._unavailable_since: float | None = None
+        self._unavailable: Sequence[str] = ()
+        self._last_error: str | None = None
+        # Kinds of issue currently raised for the station
+        self._issues: set[str] = set()
+
+    @property
+    def client_error_ratio(self) -> float:
+        """Return the share of client errors over the recent pushes."""
+        if not self._outcomes:
+            return 0.0
+        return self._client_errors / len(self._outcomes)
+
+    def record_sources(self, unavailable: Sequence[str]) -> None:
+        """Record which mapped entities were unavailable for a cycle."""
+        self._unavailable = unavailable
+        if not unavailable:
+            self._unavailable_since = None
+        elif self._unavailable_since is None:
+            self._unavailable_since = time.monotonic()
+
+    def record_push(self, result: PushResult) -> None:
+        """Add the outcome of a push that reached the API to the window."""
+        if result.short_circuited:
+            return
+
+        # Too Many Requests is a passing condition, not a configuration error
+        client_error = (
+            result.status is not None
+            and 400 <= result.status < 500
+            and result.status != 429
+        )
+        if client_error:
+            self._last_error = result.error
+
+        outcomes = self._outcomes
+        if len(outcomes) == outcomes.maxlen and outcomes[0]:
+            self._client_errors -= 1
+        outcomes.append(client_error)
+        if client_error:
+            self._client_errors += 1
+
+    @callback
+    def async_evaluate(self, breaker: CircuitBreaker) -> None:
+        """Raise or clear the issues of the station and the circuit breaker."""
+        now = time.monotonic()
+        since = self._unavailable_since
+        self._async_set(
+            ISSUE_SOURCES_UNAVAILABLE,
+            since is not None and now - since >= REPAIR_SOURCES_UNAVAILABLE_AFTER,
+            ir.IssueSeverity.WARNING,
+            {"entities": ", ".join(self._unavailable)},
+        )
+
+        # Clear only once the ratio has dropped well below the threshold
+        ratio = self.client_error_ratio
+        if ISSUE_CLIENT_ERRORS in self._issues:
+            client_errors = ratio >= REPAIR_CLIENT_ERROR_RATIO / 2
+        else:
+            client_errors = (
+                len(self._outcomes) >= REPAIR_CLIENT_ERROR_MIN_PUSHES
+                and ratio >= REPAIR_CLIENT_ERROR_RATIO
+            )
+        self._async_set(
+            ISSUE_CLIENT_ERRORS,
+            client_errors,
+            ir.IssueSeverity.ERROR,
+            {"error": self._last_error or ""},
+        )
+
+        async_check_circuit(self.hass, breaker)
+
+    @callback
+    def async_clear(self) -> None:
+        """Remove every issue of the station."""
+        for kind in list(self._issues):
+            self._async_set(kind, False, ir.IssueSeverity.WARNING, {})
+
+    @callback
+    def _async_set(
+        self,
+        kind: str,
+        active: bool,
+        severity: ir.IssueSeverity,
+        placeholders: dict[str, Any],
+    ) -> None:
+        """Create or delete an issue when its condition changes."""
+        if active == (kind in self._issues):
+            return
+
+        issue_id = f"{kind}_{self.sensor_id}"
+        if not active:
+            self._issues.discard(kind)
+            ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+            return
+
+        self._issues.add(kind)
+        _LOGGER.debug("Raising repair issue %s", issue_id)
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            issue_id,
+            is_fixable=False,
+            severity=severity,
+            translation_key=kind,
+            translation_placeholders={"sensor_id": self.sensor_id, **placeholders},
+        )
+
+
+@callback
+def async_check_circuit(hass: HomeAssistant, breaker: CircuitBreaker) -> None:
+    """Raise or clear the issue of a circuit breaker that stays tripped.
+
+    Shared by all stations; the registry lookup is a dictionary access, so
+    the issue is only written when the breaker crosses the threshold.
+    """
+    tripped = (
+        breaker.tripped_at is not None
+        and time.monotonic() - breaker.tripped_at >= REPAIR_CIRCUIT_OPEN_AFTER
+    )
+    raised = (
+        ir.async_get(hass).async_get_issue(DOMAIN, ISSUE_CIRCUIT_OPEN) is not None
+    )
+    if tripped == raised:
+        return
+
+    if not tripped:
+        ir.async_delete_issue(hass, DOMAIN, ISSUE_CIRCUIT_OPEN)
+        return
+
+    ir.async_create_issue(
+        hass,
+        DOMAIN,
+        ISSUE_CIRCUIT_OPEN,
+        is_fixable=False,
+        severity=ir.IssueSeverity.ERROR,
+        translation_key=ISSUE_CIRCUIT_OPEN,
+        translation_placeholders={
+            "endpoint": breaker.endpoint,
+            "minutes": str(REPAIR_CIRCUIT_OPEN_AFTER // 60),
+        },
+    )
@@ -0,0 +1,86 @@
+"""Throttling of repeated log messages for the Sensor.Community integration."""
+from __future__ import annotations
+
+from collections.abc import Hashable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from .const import LOG_SUMMARY_INTERVAL
+
+
+@dataclass(slots=True)
+class _Occurrence:
+    """Suppressed repetitions of one kind of message."""
+
+    logged_at: float
+    suppressed: int = 0
+
+
+class LogLimiter:
+    """Log the first message of each kind, then one summary per interval.
+
+    Messages are grouped, for example per pin, and keyed by kind within a
+    group, for example the error class. While a kind repeats, the messages
+    in between are counted but never formatted. Clearing a group after a
+    recovery makes the next failure log right away again.
+    """
+
+    __slots__ = ("_logger", "_interval", "_occurrences")
+
+    def __init__(
+        self, logger: logging.Logger, interval: float = LOG_SUMMARY_INTERVAL
+    ) -> None:
+        """Initialize the limiter."""
+        self._logger = logger
+        self._interval = interval
+        self._occurrences: dict[tuple[Hashable, str], _Occurrence] = {}
+
+    def log(
+        self,
+        group: Hashable,
+        kind: str,
+        level: int,
+        msg: str,
+        *args: Any,
+        exc_info: BaseException | None = None,
+    ) -> None:
+        """Log a message unless the same kind was logged within the interval.
+
+        A traceback is only logged with the first message of a kind; the
+        summaries after it leave it out.
+        """
+        now = time.monotonic()
+        key = (group, kind)
+        occurrence = self._occurrences.get(key)
+
+        if occurrence is None:
+            self._occurrences[key] = _Occurrence(now)
+            self._logger.log(level, msg, *args, exc_info=exc_info)
+            return
+
+        if now - occurrence.logged_at < self._interval:
+            occurrence.suppressed += 1
+            return
+
+        if occurrence.suppressed:
+            msg += " (suppressed %d similar messages in the last %d minutes)"
+            args += (occurrence.suppressed, (now - occurrence.logged_at) // 60)
+        occurrence.logged_at = now
+        occurrence.suppressed = 0
+        self._logger.log(level, msg, *args)
+
+    def clear(self, group: Hashable) -> int:
+        """Forget every kind of a group.
+
+        Returns the number of messages suppressed since they were last logged.
+        """
+        suppressed = 0
+        for key in [key for key in self._occurrences if key[0] == group]:
+            suppressed += self._occurrences.pop(key).suppressed
+        return suppressed
+
+    def __contains__(self, group: Hashable) -> bool:
+        """Return True if a message of the group is being throttled."""
+        return any(key[0] == group for key in self._occurrences)
@@ -0,0 +1,162 @@
+"""Upload latency histograms for the Sensor.Community integration."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Any
+
+from .const import LATENCY_BUCKETS
+
+# Phases of an upload, in the order they happen
+PHASE_COLLECT = "collect"  # reading the source values
+PHASE_CONVERT = "convert"  # unit conversion and aggregation
+PHASE_SERIALIZE = "serialize"  # building and encoding the payload
+PHASE_QUEUE_WAIT = "queue_wait"  # waiting for a sender worker
+PHASE_NETWORK = "network"  # HTTP requests, excluding retry backoff
+PHASE_TOTAL = "total"  # from collecting until the push resolved
+PHASES = (
+    PHASE_COLLECT,
+    PHASE_CONVERT,
+    PHASE_SERIALIZE,
+    PHASE_QUEUE_WAIT,
+    PHASE_NETWORK,
+    PHASE_TOTAL,
+)
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Histogram of durations with fixed bucket bounds.
+
+    Counts live in a preallocated array, so recording a sample only finds
+    its bucket and increments a counter. Percentiles are interpolated within
+    the bucket they fall in.
+    """
+
+    __slots__ = ("_bounds", "_counts", "count", "sum", "max")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize the histogram with bucket upper bounds in seconds."""
+        self._bounds = bounds
+        # One more bucket for samples above the last bound
+        self._counts = array("Q", bytes(8 * (len(bounds) + 1)))
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a sample."""
+        self._counts[bisect_left(self._bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def bounds(self) -> tuple[float, ...]:
+        """Return the bucket upper bounds."""
+        return self._bounds
+
+    @property
+    def counts(self) -> array:
+        """Return the sample count of every bucket, overflow last."""
+        return self._counts
+
+    def percentile(self, percent: float) -> float | None:
+        """Return an estimate of a percentile, or None without samples."""
+        if not self.count:
+            return None
+
+        rank = self.count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            if not bucket_count or seen + bucket_count < rank:
+                seen += bucket_count
+                continue
+
+            lower = self._bounds[index - 1] if index else 0.0
+            upper = self._bounds[index] if index < len(self._bounds) else self.max
+            upper = min(upper, self.max)
+            return lower + (upper - lower) * (rank - seen) / bucket_count
+
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary in milliseconds for diagnostics."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else None,
+            "max_ms": round(self.max * 1000, 3),
+            **{
+                f"p{percent}_ms": (
+                    None if (value := self.percentile(percent)) is None
+                    else round(value * 1000, 3)
+                )
+                for percent in PERCENTILES
+            },
+        }
+
+
+class UploadMetrics:
+    """Latency histograms of every upload phase and push counters of a station.
+
+    The version changes with every update, so exporters can cache anything
+    rendered from an unchanged version.
+    """
+
+    __slots__ = (
+        "histograms",
+        "uploads",
+        "errors",
+        "partial",
+        "skipped",
+        "held",
+        "version",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.histograms = {phase: LatencyHistogram() for phase in PHASES}
+        # Successful pushes per pin, and failed pushes per (pin, error class)
+        self.uploads: dict[int, int] = {}
+        self.errors: dict[tuple[int, str], int] = {}
+        # Pins sent without their unavailable fields, and pins not sent
+        self.partial: dict[int, int] = {}
+        self.skipped: dict[int, int] = {}
+        # Last good values sent per field while the source was unavailable
+        self.held: dict[str, int] = {}
+        self.version = 0
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Add a sample to a phase."""
+        self.histograms[phase].record(seconds)
+        self.version += 1
+
+    def record_push(self, pin: int, error_class: str | None) -> None:
+        """Count a push of a pin, successful when error_class is None."""
+        if error_class is None:
+            self.uploads[pin] = self.uploads.get(pin, 0) + 1
+        else:
+            key = (pin, error_class)
+            self.errors[key] = self.errors.get(key, 0) + 1
+        self.version += 1
+
+    def record_partial(self, pin: int) -> None:
+        """Count a pin sent without some of its fields."""
+        self.partial[pin] = self.partial.get(pin, 0) + 1
+        self.version += 1
+
+    def record_skipped(self, pin: int) -> None:
+        """Count a pin not sent because its sources were unavailable."""
+        self.skipped[pin] = self.skipped.get(pin, 0) + 1
+        self.version += 1
+
+    def record_held(self, field: str) -> None:
+        """Count a field sent with the last good value of its source."""
+        self.held[field] = self.held.get(field, 0) + 1
+        self.version += 1
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return all histograms for diagnostics."""
+        return {phase: hist.as_dict() for phase, hist in self.histograms.items()}
@@ -0,0 +1,206 @@
+"""OpenMetrics endpoint for the Sensor.Community integration."""
+from __future__ import annotations
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CIRCUIT_STATES,
+    DATA_SENDER,
+    DATA_TRANSPORT,
+    DOMAIN,
+    METRICS_URL,
+)
+from .coordinator import SensorCommunityCoordinator
+from .metrics import LatencyHistogram, UploadMetrics
+from .sender import UploadSender
+from .station import StationUploader
+from .transport import SensorCommunityTransport
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = DOMAIN
+
+# Families rendered per station, with their type and help text
+STATION_FAMILIES: tuple[tuple[str, str, str], ...] = (
+    (f"{PREFIX}_uploads", "counter", "Successful pushes to the API."),
+    (f"{PREFIX}_upload_errors", "counter", "Failed pushes by error class."),
+    (f"{PREFIX}_partial_uploads", "counter", "Pins sent without unavailable fields."),
+    (f"{PREFIX}_skipped_uploads", "counter", "Pins not sent, sources unavailable."),
+    (f"{PREFIX}_held_values", "counter", "Last good values sent in an outage."),
+    (f"{PREFIX}_upload_latency_seconds", "histogram", "Duration of upload phases."),
+)
+
+
+def _render_histogram(
+    lines: list[str], name: str, labels: str, histogram: LatencyHistogram
+) -> None:
+    """Append the samples of a histogram."""
+    cumulative = 0
+    counts = histogram.counts
+    for index, bound in enumerate(histogram.bounds):
+        cumulative += counts[index]
+        lines.append(f'{name}_bucket{{{labels},le="{bound!r}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+
+
+def render_station(station: StationUploader) -> tuple[str, ...]:
+    """Render the samples of a station, one text block per family."""
+    metrics = station.metrics
+    sensor_id = station.sensor_id
+
+    uploads = [
+        f'{PREFIX}_uploads_total{{sensor_id="{sensor_id}",pin="{pin}"}} {count}'
+        for pin, count in metrics.uploads.items()
+    ]
+    errors = [
+        f'{PREFIX}_upload_errors_total{{sensor_id="{sensor_id}",pin="{pin}",'
+        f'class="{error_class}"}} {count}'
+        for (pin, error_class), count in metrics.errors.items()
+    ]
+    partial = [
+        f'{PREFIX}_partial_uploads_total{{sensor_id="{sensor_id}",pin="{pin}"}} {count}'
+        for pin, count in metrics.partial.items()
+    ]
+    skipped = [
+        f'{PREFIX}_skipped_uploads_total{{sensor_id="{sensor_id}",pin="{pin}"}} {count}'
+        for pin, count in metrics.skipped.items()
+    ]
+    held = [
+        f'{PREFIX}_held_values_total{{sensor_id="{sensor_id}",field="{field}"}} {count}'
+        for field, count in metrics.held.items()
+    ]
+    latency: list[str] = []
+    for phase, histogram in metrics.histograms.items():
+        _render_histogram(
+            latency,
+            f"{PREFIX}_upload_latency_seconds",
+            f'sensor_id="{sensor_id}",phase="{phase}"',
+            histogram,
+        )
+
+    return tuple(
+        "".join(f"{line}\n" for line in block)
+        for block in (uploads, errors, partial, skipped, held, latency)
+    )
+
+
+class OpenMetricsRenderer:
+    """Render metrics of all stations, reusing text of unchanged stations.
+
+    Counters and histograms are rendered per station and cached until the
+    station records something new, so a scrape mostly joins cached strings.
+    Gauges are cheap and rendered on every scrape.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the renderer."""
+        self.hass = hass
+        # Keyed by sensor ID; a reload gives a station new metrics that
+        # count from zero again, so the metrics object is part of the check
+        self._cache: dict[str, tuple[UploadMetrics, int, tuple[str, ...]]] = {}
+
+    def _stations(self) -> list[StationUploader]:
+        """Return the stations of all loaded entries."""
+        return [
+            station
+            for coordinator in self.hass.data.get(DOMAIN, {}).values()
+            if isinstance(coordinator, SensorCommunityCoordinator)
+            for station in coordinator.stations.values()
+        ]
+
+    def _station_blocks(self, station: StationUploader) -> tuple[str, ...]:
+        """Return the rendered families of a station from the cache."""
+        metrics = station.metrics
+        cached = self._cache.get(station.sensor_id)
+        if cached is None or cached[0] is not metrics or cached[1] != metrics.version:
+            cached = (metrics, metrics.version, render_station(station))
+            self._cache[station.sensor_id] = cached
+        return cached[2]
+
+    def render(self) -> str:
+        """Render the full exposition."""
+        stations = self._stations()
+        blocks = [self._station_blocks(station) for station in stations]
+
+        # Forget stations that were removed
+        if len(self._cache) > len(stations):
+            current = {station.sensor_id for station in stations}
+            for sensor_id in [key for key in self._cache if key not in current]:
+                del self._cache[sensor_id]
+
+        parts: list[str] = []
+        for index, (name, metric_type, help_text) in enumerate(STATION_FAMILIES):
+            parts.append(f"# TYPE {name} {metric_type}\n# HELP {name} {help_text}\n")
+            parts.extend(station_blocks[index] for station_blocks in blocks)
+
+        parts.append(self._render_gauges(stations))
+        parts.append("# EOF\n")
+        return "".join(parts)
+
+    def _render_gauges(self, stations: list[StationUploader]) -> str:
+        """Render the gauges of the outbox, sender and circuit breaker."""
+        lines = [
+            f"# TYPE {PREFIX}_queued_readings gauge",
+            f"# HELP {PREFIX}_queued_readings Readings waiting in the outbox.",
+        ]
+        for station in stations:
+            for pin_plan in station.plan.pins:
+                lines.append(
+                    f'{PREFIX}_queued_readings{{sensor_id="{station.sensor_id}",'
+                    f'pin="{pin_plan.pin}"}} '
+                    f"{station.queued_readings(pin_plan.pin)}"
+                )
+
+        sender: UploadSender | None = self.hass.data[DOMAIN].get(DATA_SENDER)
+        if sender is not None:
+            lines += [
+                f"# TYPE {PREFIX}_sender_queue_depth gauge",
+                f"# HELP {PREFIX}_sender_queue_depth Payloads waiting for a worker.",
+                f"{PREFIX}_sender_queue_depth {sender.queue_depth}",
+                f"# TYPE {PREFIX}_sender_busy_workers gauge",
+                f"# HELP {PREFIX}_sender_busy_workers Workers sending a payload.",
+                f"{PREFIX}_sender_busy_workers {sender.busy}",
+            ]
+
+        transport: SensorCommunityTransport | None = self.hass.data[DOMAIN].get(
+            DATA_TRANSPORT
+        )
+        if transport is not None:
+            breaker = transport.circuit_breaker()
+            lines += [
+                f"# TYPE {PREFIX}_requests_in_flight gauge",
+                f"# HELP {PREFIX}_requests_in_flight Requests being sent to the API.",
+                f"{PREFIX}_requests_in_flight {transport.in_flight}",
+                f"# TYPE {PREFIX}_circuit_state stateset",
+                f"# HELP {PREFIX}_circuit_state State of the API circuit breaker.",
+            ]
+            lines.extend(
+                f'{PREFIX}_circuit_state{{{PREFIX}_circuit_state="{state}"}} '
+                f"{int(breaker.state == state)}"
+                for state in CIRCUIT_STATES
+            )
+
+        return "".join(f"{line}\n" for line in lines)
+
+
+class SensorCommunityMetricsView(HomeAssistantView):
+    """Serve upload metrics in the OpenMetrics text format."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    def __init__(self, renderer: OpenMetricsRenderer) -> None:
+        """Initialize the view."""
+        self._renderer = renderer
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics of all stations."""
+        return web.Response(
+            body=self._renderer.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
@@ -0,0 +1,171 @@
+"""Persistent outbox for Sensor.Community readings that failed to upload."""
+from __future__ import annotations
+
+from collections import deque
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    OUTBOX_MAX_ITEMS,
+    OUTBOX_SAVE_DELAY,
+    OUTBOX_STORAGE_KEY,
+    OUTBOX_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _queue_key(sensor_id: str, pin: int) -> str:
+    """Return the storage key for a sensor ID and pin."""
+    return f"{sensor_id}:{pin}"
+
+
+class SensorCommunityOutbox:
+    """Durable queue of readings, kept per sensor ID and pin.
+
+    Readings are only written to disk when the queue changes, and writes are
+    debounced through the storage helper, so a healthy network causes no
+    disk I/O at all.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the outbox."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, OUTBOX_STORAGE_VERSION, OUTBOX_STORAGE_KEY
+        )
+        self._queues: dict[str, deque[dict[str, Any]]] = {}
+        # Readings per sensor ID, so a station's total needs no key scan
+        self._counts: dict[str, int] = {}
+
+    async def async_load(self) -> None:
+        """Load queued readings from storage."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        for key, items in stored.get("queues", {}).items():
+            queue = self._queues[key] = deque(items, maxlen=OUTBOX_MAX_ITEMS)
+            sensor_id = key.rpartition(":")[0]
+            self._counts[sensor_id] = self._counts.get(sensor_id, 0) + len(queue)
+
+        _LOGGER.debug(
+            "Loaded %d queued Sensor.Community readings", self.total_pending
+        )
+
+    @property
+    def total_pending(self) -> int:
+        """Return the number of queued readings across all stations."""
+        return sum(self._counts.values())
+
+    def pending(self, sensor_id: str, pin: int | None = None) -> int:
+        """Return the number of queued readings for a station or one pin."""
+        if pin is not None:
+            return len(self._queues.get(_queue_key(sensor_id, pin), ()))
+        return self._counts.get(sensor_id, 0)
+
+    @callback
+    def async_enqueue(
+        self, sensor_id: str, pin: int, payload: dict[str, Any]
+    ) -> None:
+        """Queue a reading; the oldest one is dropped when the queue is full."""
+        key = _queue_key(sensor_id, pin)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = deque(maxlen=OUTBOX_MAX_ITEMS)
+
+        if len(queue) == OUTBOX_MAX_ITEMS:
+            _LOGGER.debug("Outbox for %s is full, dropping oldest reading", key)
+        else:
+            self._counts[sensor_id] = self._counts.get(sensor_id, 0) + 1
+
+        queue.append({"queued_at": time.time(), "payload": payload})
+        self._async_schedule_save()
+
+    def peek(self, sensor_id: str, pin: int) -> dict[str, Any] | None:
+        """Return the oldest queued reading without removing it."""
+        queue = self._queues.get(_queue_key(sensor_id, pin))
+        return queue[0] if queue else None
+
+    @callback
+    def async_pop(self, sensor_id: str, pin: int) -> None:
+        """Remove the oldest queued reading."""
+        key = _queue_key(sensor_id, pin)
+        queue = self._queues.get(key)
+        if not queue:
+            return
+
+        queue.popleft()
+        self._async_removed(sensor_id, key, 1)
+
+    @callback
+    def async_expire(self, sensor_id: str, pin: int, max_age: float) -> int:
+        """Drop queued readings older than max_age seconds.
+
+        Returns the number of dropped readings.
+        """
+        key = _queue_key(sensor_id, pin)
+        queue = self._queues.get(key)
+        if not queue:
+            return 0
+
+        cutoff = time.time() - max_age
+        dropped = 0
+        while queue and queue[0]["queued_at"] < cutoff:
+            queue.popleft()
+            dropped += 1
+        if dropped:
+            self._async_removed(sensor_id, key, dropped)
+        return dropped
+
+    @callback
+    def async_discard(self, sensor_id: str, pin: int) -> int:
+        """Drop all queued readings of a pin.
+
+        Returns the number of dropped readings.
+        """
+        key = _queue_key(sensor_id, pin)
+        queue = self._queues.get(key)
+        if not queue:
+            return 0
+
+        dropped = len(queue)
+        queue.clear()
+        self._async_removed(sensor_id, key, dropped)
+        return dropped
+
+    @callback
+    def async_purge(self, sensor_id: str) -> None:
+        """Drop all queued readings for a station."""
+        prefix = f"{sensor_id}:"
+        keys = [key for key in self._queues if key.startswith(prefix)]
+        for key in keys:
+            del self._queues[key]
+        self._counts.pop(sensor_id, None)
+        if keys:
+            self._async_schedule_save()
+
+    @callback
+    def _async_removed(self, sensor_id: str, key: str, count: int) -> None:
+        """Update the bookkeeping after readings were removed from a queue."""
+        if not self._queues[key]:
+            del self._queues[key]
+        if (remaining := self._counts[sensor_id] - count) > 0:
+            self._counts[sensor_id] = remaining
+        else:
+            del self._counts[sensor_id]
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule a debounced write of the outbox."""
+        self._store.async_delay_save(self._data_to_save, OUTBOX_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"queues": {key: list(queue) for key, queue in self._queues.items()}}
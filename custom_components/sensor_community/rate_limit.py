@@ -0,0 +1,106 @@
+"""Client-side rate limiting of Sensor.Community uploads."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from .const import RATE_LIMIT_BURST, RATE_LIMIT_PERIOD
+
+
+class TokenBucket:
+    """Token bucket allowing a burst of requests and a steady rate after it.
+
+    Tokens are refilled lazily from the elapsed time whenever the bucket is
+    used, so idle buckets cost nothing.
+    """
+
+    __slots__ = (
+        "rate",
+        "capacity",
+        "tokens",
+        "updated",
+        "throttled",
+        "merged",
+        "skipped_retries",
+    )
+
+    def __init__(
+        self,
+        capacity: float = RATE_LIMIT_BURST,
+        period: float = RATE_LIMIT_PERIOD,
+    ) -> None:
+        """Initialize a full bucket that gains one token per period."""
+        self.rate = 1 / period
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+        # Pushes that had to wait for a token, pushes folded into them, and
+        # retries given up for lack of a token
+        self.throttled = 0
+        self.merged = 0
+        self.skipped_retries = 0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last use."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def async_acquire(self) -> None:
+        """Wait for a token and take it."""
+        while not self.try_acquire():
+            await asyncio.sleep(self.delay())
+
+    def delay(self) -> float:
+        """Return the seconds until the next token is available."""
+        self._refill()
+        return max(1 - self.tokens, 0.0) / self.rate
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return the bucket state for diagnostics."""
+        self._refill()
+        return {
+            "tokens": round(self.tokens, 2),
+            "throttled": self.throttled,
+            "merged": self.merged,
+            "skipped_retries": self.skipped_retries,
+        }
+
+
+class UploadRateLimiter:
+    """Token buckets per sensor ID and pin, shared by all config entries.
+
+    Kept in hass.data for the lifetime of Home Assistant rather than in the
+    transport, so reloading the only config entry does not refill the
+    buckets.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the limiter."""
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, sensor_id: str | None, pin: str | None) -> TokenBucket:
+        """Return the token bucket for a sensor ID and pin."""
+        key = f"{sensor_id}:{pin}"
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket()
+        return bucket
+
+    def as_dict(self, sensor_id: str) -> dict[str, dict[str, float | int]]:
+        """Return the bucket state per pin of a sensor ID for diagnostics."""
+        prefix = f"{sensor_id}:"
+        return {
+            key.removeprefix(prefix): bucket.as_dict()
+            for key, bucket in self._buckets.items()
+            if key.startswith(prefix)
+        }
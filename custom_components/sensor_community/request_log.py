@@ -0,0 +1,72 @@
+"""Recent API requests of a station, kept for debugging."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .const import API_URL, DEBUG_REQUEST_LOG_SIZE
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    """A request sent to the API and its outcome."""
+
+    time: datetime
+    pin: int
+    headers: Mapping[str, str]
+    payload: dict[str, Any]
+    body_size: int
+    success: bool
+    status: int | None
+    error: str | None
+    attempts: int
+    # Seconds waiting for a worker, on HTTP requests, and in total
+    queue_wait: float
+    network: float
+    total: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record for diagnostics."""
+        return {
+            "time": self.time.isoformat(),
+            "url": API_URL,
+            "headers": dict(self.headers),
+            "payload": self.payload,
+            "body_size": self.body_size,
+            "success": self.success,
+            "status": self.status,
+            "error": self.error,
+            "attempts": self.attempts,
+            "queue_wait": self.queue_wait,
+            "network": self.network,
+            "total": self.total,
+        }
+
+
+class RequestLog:
+    """The most recent requests of a station, oldest dropped first.
+
+    Records live in memory only and are exported through the diagnostics
+    download, so they never reach the state machine or the recorder.
+    """
+
+    __slots__ = ("_records",)
+
+    def __init__(self, size: int = DEBUG_REQUEST_LOG_SIZE) -> None:
+        """Initialize the log."""
+        self._records: deque[RequestRecord] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return len(self._records)
+
+    def add(self, record: RequestRecord) -> None:
+        """Add a record, dropping the oldest one when full."""
+        self._records.append(record)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return all records for diagnostics, newest first."""
+        return [record.as_dict() for record in reversed(self._records)]
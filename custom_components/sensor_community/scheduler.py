@@ -0,0 +1,211 @@
+"""Domain-wide upload scheduler for Sensor.Community stations."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import heapq
+import logging
+import math
+import time
+from typing import Any
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, SCHEDULER_COALESCE_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+UploadJob = Callable[[], Coroutine[Any, Any, None]]
+
+
+def station_phase(key: str, interval: float) -> float:
+    """Return the deterministic offset of a station within its interval.
+
+    The offset is derived from the key alone, so a station keeps its slot
+    across restarts and stations are spread evenly over the interval.
+    """
+    return (zlib.crc32(key.encode()) / 2**32) * interval
+
+
+@dataclass(slots=True)
+class _ScheduledJob:
+    """A station registered with the scheduler."""
+
+    key: str
+    interval: float
+    job: UploadJob
+    due: float
+    generation: int
+    last_run: float | None = None
+
+
+class UploadScheduler:
+    """Run every station of the domain from a single min-heap of due times.
+
+    Each station fires at a fixed phase within its interval, measured on the
+    wall clock, instead of whenever its entry happened to be set up. After a
+    restart, stations therefore do not upload in lockstep. One timer is armed
+    for the earliest due station; when it fires, every station due within
+    the coalescing window runs in the same wake-up.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coalesce_window: float = SCHEDULER_COALESCE_WINDOW,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._coalesce_window = coalesce_window
+        self._jobs: dict[str, _ScheduledJob] = {}
+        # (due, generation, key); stale entries are skipped when popped
+        self._heap: list[tuple[float, int, str]] = []
+        self._generation = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_due: float | None = None
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+
+        self.wakeups = 0
+        self.runs = 0
+
+    @callback
+    def async_schedule(
+        self, key: str, interval: float, job: UploadJob
+    ) -> CALLBACK_TYPE:
+        """Run a job at the phase of its key every interval.
+
+        Returns a callback that removes the job and cancels a running upload.
+        """
+        loop = self.hass.loop
+        offset = (station_phase(key, interval) - time.time()) % interval
+        self._generation += 1
+        scheduled = _ScheduledJob(
+            key, interval, job, loop.time() + offset, self._generation
+        )
+        self._jobs[key] = scheduled
+        self._push(scheduled)
+
+        @callback
+        def _async_unschedule() -> None:
+            """Remove the job."""
+            if self._jobs.get(key) is scheduled:
+                del self._jobs[key]
+            if task := self._tasks.pop(key, None):
+                task.cancel()
+
+        return _async_unschedule
+
+    @callback
+    def async_reschedule(self, key: str, interval: float) -> None:
+        """Change the interval of a job.
+
+        The next run moves to the phase of the new interval, but not earlier
+        than one new interval after the previous run.
+        """
+        scheduled = self._jobs.get(key)
+        if scheduled is None or interval == scheduled.interval:
+            return
+
+        now = self.hass.loop.time()
+        earliest = now
+        if scheduled.last_run is not None:
+            earliest = max(now, scheduled.last_run + interval)
+        wall_clock = time.time() + (earliest - now)
+        offset = (station_phase(key, interval) - wall_clock) % interval
+
+        self._generation += 1
+        scheduled.interval = interval
+        scheduled.generation = self._generation
+        scheduled.due = earliest + offset
+        self._push(scheduled)
+
+    def next_run(self, key: str) -> datetime | None:
+        """Return when a job runs next."""
+        if (scheduled := self._jobs.get(key)) is None:
+            return None
+        return datetime.now() + timedelta(seconds=scheduled.due - self.hass.loop.time())
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of jobs currently running."""
+        return len(self._tasks)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return scheduler state for diagnostics."""
+        return {
+            "scheduled": len(self._jobs),
+            "in_flight": self.in_flight,
+            "wakeups": self.wakeups,
+            "runs": self.runs,
+        }
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timer and all running jobs."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = self._timer_due = None
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._jobs.clear()
+        self._heap.clear()
+
+    def _push(self, scheduled: _ScheduledJob) -> None:
+        """Add a job to the heap and re-arm the timer if it is due first."""
+        heapq.heappush(self._heap, (scheduled.due, scheduled.generation, scheduled.key))
+        if self._timer_due is None or scheduled.due < self._timer_due:
+            self._arm(scheduled.due)
+
+    def _arm(self, due: float) -> None:
+        """Arm the timer for a due time."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_due = due
+        self._timer = self.hass.loop.call_at(due, self._async_wake)
+
+    @callback
+    def _async_wake(self) -> None:
+        """Start every job due within the coalescing window."""
+        self._timer = self._timer_due = None
+        self.wakeups += 1
+        now = self.hass.loop.time()
+        horizon = now + self._coalesce_window
+
+        while self._heap and self._heap[0][0] <= horizon:
+            _, generation, key = heapq.heappop(self._heap)
+            scheduled = self._jobs.get(key)
+            if scheduled is None or scheduled.generation != generation:
+                continue
+
+            self._async_start(scheduled)
+
+            # Stay on the phase grid, skipping slots missed while stalled
+            scheduled.due += scheduled.interval * max(
+                math.ceil((now - scheduled.due) / scheduled.interval), 1
+            )
+            heapq.heappush(self._heap, (scheduled.due, generation, key))
+
+        if self._heap:
+            self._arm(self._heap[0][0])
+
+    @callback
+    def _async_start(self, scheduled: _ScheduledJob) -> None:
+        """Run a job as a background task."""
+        key = scheduled.key
+        self.runs += 1
+        scheduled.last_run = self.hass.loop.time()
+        task = self.hass.async_create_background_task(
+            scheduled.job(), name=f"{DOMAIN} upload {key}"
+        )
+        self._tasks[key] = task
+
+        @callback
+        def _async_done(task: asyncio.Task[None]) -> None:
+            """Forget the finished task."""
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+        task.add_done_callback(_async_done)
@@ -0,0 +1,265 @@
+"""Worker pool sending Sensor.Community uploads for all config entries."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DEFAULT_SENDER_WORKERS, DOMAIN, SENDER_QUEUE_SIZE
+from .rate_limit import TokenBucket, UploadRateLimiter
+from .transport import PushResult, SensorCommunityTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class TimingStats:
+    """Running count, mean and maximum of a duration."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Record a duration."""
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return the statistics for diagnostics."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+@dataclass(slots=True)
+class _SendJob:
+    """A payload waiting for a worker."""
+
+    headers: Mapping[str, str]
+    payload: bytes
+    retry: bool
+    future: asyncio.Future[PushResult]
+    queued_at: float
+
+
+@dataclass(slots=True)
+class _DeferredJob:
+    """A payload waiting for a rate limit token; later payloads replace it."""
+
+    headers: Mapping[str, str]
+    payload: bytes
+    retry: bool
+    future: asyncio.Future[PushResult]
+    task: asyncio.Task[None] | None = None
+
+
+class UploadSender:
+    """Send payloads from a bounded queue with a fixed number of workers.
+
+    Stations hand their payloads to the queue and return; the workers push
+    them through the shared transport and resolve a future per payload. When
+    the queue is full, submitting waits for room, so a burst of reloads slows
+    down producers instead of opening hundreds of connections.
+
+    Payloads are limited per sensor ID and pin before they are queued. A
+    payload that finds its token bucket empty waits for the next token in a
+    task of its own, not in a worker, and payloads for the same sensor ID and
+    pin arriving in the meantime are merged into it: only the newest payload
+    is sent and every submitter gets its result.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        transport: SensorCommunityTransport,
+        rate_limiter: UploadRateLimiter,
+        workers: int = DEFAULT_SENDER_WORKERS,
+        queue_size: int = SENDER_QUEUE_SIZE,
+    ) -> None:
+        """Initialize the sender."""
+        self.hass = hass
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+        self.workers = workers
+        self._queue: asyncio.Queue[_SendJob] = asyncio.Queue(queue_size)
+        self._tasks: list[asyncio.Task[None]] = []
+        self._deferred: dict[str, _DeferredJob] = {}
+
+        self.busy = 0
+        self.max_queue_depth = 0
+        self.wait_time = TimingStats()
+        self.service_time = TimingStats()
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of payloads waiting for a worker."""
+        return self._queue.qsize()
+
+    @callback
+    def async_start(self) -> None:
+        """Start the workers."""
+        if self._tasks:
+            return
+
+        self._tasks = [
+            self.hass.async_create_background_task(
+                self._async_worker(), name=f"{DOMAIN} sender {index}"
+            )
+            for index in range(self.workers)
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the workers and cancel payloads that were not sent."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            job.future.cancel()
+            self._queue.task_done()
+
+        for deferred in self._deferred.values():
+            if deferred.task is not None:
+                deferred.task.cancel()
+            deferred.future.cancel()
+        self._deferred = {}
+
+    async def async_submit(
+        self,
+        headers: Mapping[str, str],
+        payload: bytes,
+        retry: bool = True,
+        merge: bool = True,
+    ) -> asyncio.Future[PushResult]:
+        """Queue a payload, waiting while the queue is full.
+
+        Returns a future that resolves to the push result once a worker has
+        sent the payload. Cancelling the future drops a payload that has not
+        been picked up yet. Replays from the outbox pass merge=False, as each
+        of them is a distinct reading; they wait here for their token instead.
+        """
+        loop = self.hass.loop
+        sensor_id, pin = headers.get("X-Sensor"), headers.get("X-Pin")
+        key = f"{sensor_id}:{pin}"
+        bucket = self.rate_limiter.bucket(sensor_id, pin)
+
+        if not merge:
+            await bucket.async_acquire()
+        else:
+            deferred = self._deferred.get(key)
+            if deferred is not None and not deferred.future.done():
+                deferred.payload = payload
+                bucket.merged += 1
+                _LOGGER.debug("Merged push for %s into the deferred push", key)
+                return deferred.future
+
+            if not bucket.try_acquire():
+                bucket.throttled += 1
+                deferred = self._deferred[key] = _DeferredJob(
+                    headers, payload, retry, loop.create_future()
+                )
+                _LOGGER.debug(
+                    "Rate limit reached for %s, deferring push by %.1f seconds",
+                    key,
+                    bucket.delay(),
+                )
+                deferred.task = self.hass.async_create_background_task(
+                    self._async_release_deferred(key, deferred, bucket),
+                    name=f"{DOMAIN} deferred push {key}",
+                )
+                return deferred.future
+
+        future: asyncio.Future[PushResult] = loop.create_future()
+        await self._async_put(_SendJob(headers, payload, retry, future, loop.time()))
+        return future
+
+    async def _async_release_deferred(
+        self, key: str, deferred: _DeferredJob, bucket: TokenBucket
+    ) -> None:
+        """Queue a deferred payload once its bucket has a token again."""
+        try:
+            await bucket.async_acquire()
+        finally:
+            # Payloads submitted from now on start a new deferral
+            if self._deferred.get(key) is deferred:
+                del self._deferred[key]
+
+        if not deferred.future.done():
+            await self._async_put(
+                _SendJob(
+                    deferred.headers,
+                    deferred.payload,
+                    deferred.retry,
+                    deferred.future,
+                    self.hass.loop.time(),
+                )
+            )
+
+    async def _async_put(self, job: _SendJob) -> None:
+        """Put a job on the queue, waiting while the queue is full."""
+        await self._queue.put(job)
+
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    async def _async_worker(self) -> None:
+        """Send queued payloads one at a time."""
+        loop = self.hass.loop
+
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.future.done():
+                    continue
+
+                started = loop.time()
+                waited = started - job.queued_at
+                self.wait_time.add(waited)
+                self.busy += 1
+                try:
+                    result = await self.transport.async_push(
+                        job.headers,
+                        job.payload,
+                        retry=job.retry,
+                        rate_limit=self.rate_limiter.bucket(
+                            job.headers.get("X-Sensor"), job.headers.get("X-Pin")
+                        ),
+                    )
+                except asyncio.CancelledError:
+                    job.future.cancel()
+                    raise
+                except Exception as err:
+                    # Handed to the submitter, which logs it
+                    if not job.future.done():
+                        job.future.set_exception(err)
+                else:
+                    if not job.future.done():
+                        job.future.set_result(replace(result, queue_wait=waited))
+                finally:
+                    self.busy -= 1
+                    self.service_time.add(loop.time() - started)
+            finally:
+                self._queue.task_done()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return sender statistics for diagnostics."""
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "wait_time": self.wait_time.as_dict(),
+            "service_time": self.service_time.as_dict(),
+        }
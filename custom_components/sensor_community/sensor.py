@@ -7,15 +7,19 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_SENSOR_ID, DOMAIN
+from .const import DOMAIN
 from .coordinator import SensorCommunityCoordinator
+from .metrics import PERCENTILES, PHASE_NETWORK, PHASE_QUEUE_WAIT, PHASE_TOTAL
+from .station import StationUploader
 
 # Status options for the enum sensor
 STATUS_PENDING = "pending"
@@ -23,6 +27,9 @@ STATUS_OK = "ok"
 STATUS_ERROR = "error"
 STATUS_OPTIONS = [STATUS_PENDING, STATUS_OK, STATUS_ERROR]
 
+# Phases with optional latency sensors; the others are only in diagnostics
+LATENCY_SENSOR_PHASES = (PHASE_QUEUE_WAIT, PHASE_NETWORK, PHASE_TOTAL)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -32,49 +39,107 @@ async def async_setup_entry(
     """Set up Sensor.Community sensor from a config entry."""
     coordinator: SensorCommunityCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities([SensorCommunityStatusSensor(coordinator, entry)])
+    entities: list[SensorEntity] = []
+    for station in coordinator.stations.values():
+        entities.append(SensorCommunityStatusSensor(coordinator, entry, station))
+        entities.append(SensorCommunityUploadCountSensor(coordinator, entry, station))
+        entities.extend(
+            SensorCommunityLatencySensor(coordinator, entry, station, phase, percent)
+            for phase in LATENCY_SENSOR_PHASES
+            for percent in PERCENTILES
+        )
 
+    async_add_entities(entities)
 
-class SensorCommunityStatusSensor(
-    CoordinatorEntity[SensorCommunityCoordinator], SensorEntity
-):
-    """Sensor representing the Sensor.Community upload status."""
 
-    entity_description = SensorEntityDescription(
-        key="status",
-        translation_key="status",
-        icon="mdi:cloud-upload",
-        device_class=SensorDeviceClass.ENUM,
-    )
+class SensorCommunityEntity(CoordinatorEntity[SensorCommunityCoordinator]):
+    """Base entity for a Sensor.Community station."""
 
     _attr_has_entity_name = True
-    _attr_options = STATUS_OPTIONS
+    _state_fingerprint: tuple[Any, ...] | None = None
 
     def __init__(
         self,
         coordinator: SensorCommunityCoordinator,
         entry: ConfigEntry,
+        station: StationUploader,
     ) -> None:
-        """Initialize the sensor."""
+        """Initialize the entity."""
         super().__init__(coordinator)
         self._entry = entry
-        self._sensor_id = entry.data[CONF_SENSOR_ID]
+        self._station = station
+        self._sensor_id = station.sensor_id
+
+        # Fleet stations get their own device; single entries keep the IDs
+        # they have always used
+        device_id = entry.entry_id
+        if coordinator.is_fleet:
+            device_id = f"{entry.entry_id}_{self._sensor_id}"
 
-        self._attr_unique_id = f"{entry.entry_id}_status"
+        self._attr_unique_id = f"{device_id}_{self.entity_description.key}"
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
+            identifiers={(DOMAIN, device_id)},
             name=f"Sensor.Community ({self._sensor_id})",
             manufacturer="Sensor.Community",
             model="Air Quality Sensor",
             sw_version="1.0.0",
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Listen for updates of the station as well as of the whole entry."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_station_listener(
+                self._sensor_id, self._handle_coordinator_update
+            )
+        )
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """Return everything the entity shows in the state machine."""
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when something visible has changed.
+
+        Updates of the whole entry, such as a manual refresh of a fleet,
+        leave the entities of most stations unchanged.
+        """
+        fingerprint = self._fingerprint()
+        if fingerprint == self._state_fingerprint:
+            return
+        self._state_fingerprint = fingerprint
+        super()._handle_coordinator_update()
+
+
+class SensorCommunityStatusSensor(SensorCommunityEntity, SensorEntity):
+    """Sensor representing the Sensor.Community upload status."""
+
+    entity_description = SensorEntityDescription(
+        key="status",
+        translation_key="status",
+        icon="mdi:cloud-upload",
+        device_class=SensorDeviceClass.ENUM,
+    )
+
+    _attr_options = STATUS_OPTIONS
+    # Change with every upload; kept in the state but not in the database
+    _unrecorded_attributes = frozenset(
+        {
+            "upload_count",
+            "last_upload",
+            "next_upload",
+            "queued_readings",
+            "effective_interval",
+        }
+    )
+
     @property
     def native_value(self) -> str:
         """Return the state of the sensor."""
-        if self.coordinator.last_error:
+        if self._station.last_error:
             return STATUS_ERROR
-        elif self.coordinator.last_upload:
+        elif self._station.last_upload:
             return STATUS_OK
         else:
             return STATUS_PENDING
@@ -82,22 +147,27 @@ class SensorCommunityStatusSensor(
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
+        station = self._station
+        status = self.coordinator.data.get(self._sensor_id, {})
         attrs: dict[str, Any] = {
             "sensor_id": self._sensor_id,
-            "upload_count": self.coordinator.upload_count,
+            "upload_count": station.upload_count,
         }
 
-        if self.coordinator.last_upload:
-            attrs["last_upload"] = self.coordinator.last_upload.isoformat()
+        if station.last_upload:
+            attrs["last_upload"] = station.last_upload.isoformat()
+
+        if station.next_upload:
+            attrs["next_upload"] = station.next_upload.isoformat()
 
-        if self.coordinator.next_upload:
-            attrs["next_upload"] = self.coordinator.next_upload.isoformat()
+        if station.last_error:
+            attrs["last_error"] = station.last_error
 
-        if self.coordinator.last_error:
-            attrs["last_error"] = self.coordinator.last_error
+        if queued := status.get("queued_readings"):
+            attrs["queued_readings"] = queued
 
-        if self.coordinator.debug_mode and self.coordinator.last_request_data:
-            attrs["last_request"] = self.coordinator.last_request_data
+        attrs["effective_interval"] = status.get("effective_interval")
+        attrs["circuit_state"] = status.get("circuit_state")
 
         return attrs
 
@@ -105,3 +175,55 @@ class SensorCommunityStatusSensor(
     def available(self) -> bool:
         """Return True if entity is available."""
         return True  # Always available, shows error state if there are issues
+
+
+class SensorCommunityUploadCountSensor(SensorCommunityEntity, SensorEntity):
+    """Number of successful uploads, disabled by default."""
+
+    entity_description = SensorEntityDescription(
+        key="uploads",
+        translation_key="uploads",
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    )
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of successful uploads."""
+        return self._station.upload_count
+
+
+class SensorCommunityLatencySensor(SensorCommunityEntity, SensorEntity):
+    """Percentile of the latency of an upload phase, disabled by default."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: SensorCommunityCoordinator,
+        entry: ConfigEntry,
+        station: StationUploader,
+        phase: str,
+        percent: int,
+    ) -> None:
+        """Initialize the sensor."""
+        key = f"{phase}_p{percent}"
+        self.entity_description = SensorEntityDescription(
+            key=key, translation_key=key, icon="mdi:timer-outline"
+        )
+        super().__init__(coordinator, entry, station)
+        self._histogram = station.metrics.histograms[phase]
+        self._percent = percent
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the percentile in milliseconds."""
+        value = self._histogram.percentile(self._percent)
+        return None if value is None else value * 1000
@@ -0,0 +1,170 @@
+"""Event driven snapshot of the source entities used by Sensor.Community."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import math
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+
+_LOGGER = logging.getLogger(__name__)
+
+SnapshotListener = Callable[[str, "SnapshotValue | None"], None]
+
+
+@dataclass(slots=True)
+class SnapshotValue:
+    """Parsed state of a source entity."""
+
+    value: float | None
+    unit: str | None
+    last_updated: datetime
+    state: str
+
+    @property
+    def available(self) -> bool:
+        """Return True if the entity has a usable numeric value."""
+        return self.value is not None
+
+
+def parse_state(state: State | None) -> SnapshotValue | None:
+    """Parse a state object into a snapshot value."""
+    if state is None:
+        return None
+
+    value: float | None = None
+    if state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+        try:
+            value = float(state.state)
+        except (ValueError, TypeError):
+            _LOGGER.debug("Could not convert %s value: %s", state.entity_id, state.state)
+        else:
+            if not math.isfinite(value):
+                value = None
+
+    return SnapshotValue(
+        value=value,
+        unit=state.attributes.get("unit_of_measurement"),
+        last_updated=state.last_updated,
+        state=state.state,
+    )
+
+
+class StateSnapshotCache:
+    """Keep parsed values of tracked entities up to date from state events.
+
+    Every entity is subscribed to and parsed once, no matter how many config
+    entries map it. Reading a value is a dictionary lookup. The last usable
+    value of every entity is kept as well, so it can be held through a brief
+    outage of the source.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._values: dict[str, SnapshotValue | None] = {}
+        self._last_good: dict[str, SnapshotValue] = {}
+        self._refs: dict[str, int] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+        # Tuples, so listeners can be removed while they are being called
+        self._listeners: dict[str, tuple[SnapshotListener, ...]] = {}
+
+    def get(self, entity_id: str) -> SnapshotValue | None:
+        """Return the latest parsed value of a tracked entity."""
+        return self._values.get(entity_id)
+
+    def get_last_good(self, entity_id: str) -> SnapshotValue | None:
+        """Return the last parsed value of a tracked entity that was usable."""
+        return self._last_good.get(entity_id)
+
+    @callback
+    def async_track(self, entity_ids: Iterable[str]) -> CALLBACK_TYPE:
+        """Start tracking entities and return a callback that stops it."""
+        tracked = list(dict.fromkeys(entity_ids))
+
+        for entity_id in tracked:
+            refs = self._refs.get(entity_id, 0)
+            self._refs[entity_id] = refs + 1
+            if refs:
+                continue
+
+            self._async_set(entity_id, parse_state(self.hass.states.get(entity_id)))
+            self._unsubs[entity_id] = async_track_state_change_event(
+                self.hass, [entity_id], self._async_state_changed
+            )
+
+        @callback
+        def _async_untrack() -> None:
+            """Stop tracking the entities."""
+            for entity_id in tracked:
+                self._async_release(entity_id)
+
+        return _async_untrack
+
+    @callback
+    def async_add_listener(
+        self, entity_ids: Iterable[str], listener: SnapshotListener
+    ) -> CALLBACK_TYPE:
+        """Call a listener with the parsed value whenever an entity changes."""
+        tracked = list(dict.fromkeys(entity_ids))
+        for entity_id in tracked:
+            self._listeners[entity_id] = (*self._listeners.get(entity_id, ()), listener)
+
+        @callback
+        def _async_remove_listener() -> None:
+            """Remove the listener."""
+            for entity_id in tracked:
+                listeners = tuple(
+                    other
+                    for other in self._listeners.get(entity_id, ())
+                    if other is not listener
+                )
+                if listeners:
+                    self._listeners[entity_id] = listeners
+                else:
+                    self._listeners.pop(entity_id, None)
+
+        return _async_remove_listener
+
+    @callback
+    def _async_release(self, entity_id: str) -> None:
+        """Drop a reference to an entity and unsubscribe when unused."""
+        refs = self._refs.get(entity_id, 0) - 1
+        if refs > 0:
+            self._refs[entity_id] = refs
+            return
+
+        self._refs.pop(entity_id, None)
+        self._values.pop(entity_id, None)
+        self._last_good.pop(entity_id, None)
+        if unsub := self._unsubs.pop(entity_id, None):
+            unsub()
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Update the snapshot of an entity from a state change event."""
+        entity_id: str = event.data["entity_id"]
+        if entity_id not in self._refs:
+            return
+
+        value = parse_state(event.data["new_state"])
+        self._async_set(entity_id, value)
+        for listener in self._listeners.get(entity_id, ()):
+            listener(entity_id, value)
+
+    @callback
+    def _async_set(self, entity_id: str, value: SnapshotValue | None) -> None:
+        """Store the parsed value of an entity."""
+        self._values[entity_id] = value
+        if value is not None and value.available:
+            self._last_good[entity_id] = value
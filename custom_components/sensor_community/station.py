@@ -0,0 +1,733 @@
+"""Upload logic for a single Sensor.Community station."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+
+from .adaptive import AdaptiveInterval
+from .aggregation import AGGREGATORS, RingBuffer
+from .const import (
+    ADAPTIVE_RESCHEDULE_RATIO,
+    AGGREGATION_BUFFER_SIZE,
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_AGGREGATION,
+    CONF_DEBUG_MODE,
+    CONF_HOLD_MAX_AGE,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_OUTBOX_MAX_AGE,
+    CONF_SENSOR_ID,
+    DEFAULT_AGGREGATION,
+    DEFAULT_HOLD_MAX_AGE,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_OUTBOX_MAX_AGE,
+    DOMAIN,
+    OUTBOX_DRAIN_BATCH,
+)
+from .health import StationHealth
+from .log_limiter import LogLimiter
+from .metrics import (
+    PHASE_COLLECT,
+    PHASE_CONVERT,
+    PHASE_NETWORK,
+    PHASE_QUEUE_WAIT,
+    PHASE_SERIALIZE,
+    PHASE_TOTAL,
+    UploadMetrics,
+)
+from .outbox import SensorCommunityOutbox
+from .request_log import RequestLog, RequestRecord
+from .sender import UploadSender
+from .snapshot import SnapshotValue, StateSnapshotCache
+from .transport import ERROR_TIMEOUT, PushResult
+from .units import ConverterCache
+from .upload_plan import PinPlan, PlanField, UploadPlan, build_upload_plan
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StationUploader:
+    """Collect, convert and upload the readings of one sensor ID.
+
+    Stations own no timers, sessions or entities of their own; they are
+    run by the domain scheduler on behalf of a coordinator, which may own
+    one station or a whole fleet.
+    """
+
+    __slots__ = (
+        "hass",
+        "entry",
+        "sensor_id",
+        "plan",
+        "debug_mode",
+        "aggregation",
+        "hold_max_age",
+        "outbox_max_age",
+        "converters",
+        "metrics",
+        "update_interval",
+        "adaptive",
+        "last_upload",
+        "next_upload",
+        "last_error",
+        "upload_count",
+        "request_log",
+        "_log",
+        "health",
+        "_sender",
+        "_transport",
+        "_status_callback",
+        "_pending",
+        "_outbox",
+        "_snapshot",
+        "_cycle_in_flight",
+        "_follow_up",
+        "_follow_up_task",
+        "merged_triggers",
+        "skipped_triggers",
+        "_buffers",
+        "_entity_fields",
+        "_remove_source_listener",
+        "_interval_callback",
+        "_reported_interval",
+        "_untrack_entities",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        config: Mapping[str, Any],
+        update_interval: timedelta,
+        sender: UploadSender,
+        outbox: SensorCommunityOutbox,
+        snapshot: StateSnapshotCache,
+        status_callback: Callable[[str], None],
+        interval_callback: Callable[[str], None],
+    ) -> None:
+        """Initialize the station."""
+        self.hass = hass
+        self.entry = entry
+        self.sensor_id: str = config[CONF_SENSOR_ID]
+        self.update_interval = update_interval
+        self._sender = sender
+        self._transport = sender.transport
+        self._status_callback = status_callback
+        self._interval_callback = interval_callback
+        self._pending: set[asyncio.Future[PushResult]] = set()
+        self._outbox = outbox
+
+        # Single-flight guard around the upload cycle
+        self._cycle_in_flight = False
+        self._follow_up = False
+        self._follow_up_task: asyncio.Task[None] | None = None
+        self.merged_triggers = 0
+        self.skipped_triggers = 0
+
+        # Resolve the configuration once; an options change reloads the
+        # entry and builds a new plan
+        self.plan: UploadPlan = build_upload_plan(self.sensor_id, config)
+        self.debug_mode: bool = config.get(CONF_DEBUG_MODE, False)
+        self.aggregation: str = config.get(CONF_AGGREGATION, DEFAULT_AGGREGATION)
+        self.hold_max_age: float = config.get(CONF_HOLD_MAX_AGE, DEFAULT_HOLD_MAX_AGE)
+        self.outbox_max_age: float = config.get(
+            CONF_OUTBOX_MAX_AGE, DEFAULT_OUTBOX_MAX_AGE
+        )
+
+        # Keep parsed values of the mapped entities current from state events
+        self._snapshot = snapshot
+        self.converters = ConverterCache()
+        self.metrics = UploadMetrics()
+        self._untrack_entities = snapshot.async_track(self.plan.entity_ids)
+
+        self._entity_fields: dict[str, list[PlanField]] = {}
+        for plan_field in self.plan.fields:
+            self._entity_fields.setdefault(plan_field.entity_id, []).append(plan_field)
+
+        # Buffer every state change between uploads when aggregating
+        self._buffers: dict[str, RingBuffer] = {}
+        if self.aggregation in AGGREGATORS:
+            for plan_field in self.plan.fields:
+                self._buffers[plan_field.field] = RingBuffer(AGGREGATION_BUFFER_SIZE)
+                self._async_seed_buffer(plan_field)
+
+        # Track signal variability to move the interval between the
+        # configured interval and the maximum
+        self.adaptive: AdaptiveInterval | None = None
+        if config.get(CONF_ADAPTIVE_INTERVAL, False):
+            self.adaptive = AdaptiveInterval(
+                update_interval.total_seconds(),
+                config.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+            )
+        self._reported_interval = self.effective_interval.total_seconds()
+
+        self._remove_source_listener: CALLBACK_TYPE | None = None
+        if self._buffers:
+            self._remove_source_listener = snapshot.async_add_listener(
+                self._entity_fields, self._async_source_changed
+            )
+
+        # Status tracking
+        self.last_upload: datetime | None = None
+        self.next_upload: datetime | None = None
+        self.last_error: str | None = None
+        self.upload_count: int = 0
+        self.request_log: RequestLog | None = RequestLog() if self.debug_mode else None
+        # Repeated failures are summarized instead of logged every cycle
+        self._log = LogLimiter(_LOGGER)
+        self.health = StationHealth(hass, self.sensor_id)
+
+    @property
+    def effective_interval(self) -> timedelta:
+        """Return the interval the station currently uploads at."""
+        if self.adaptive is None:
+            return self.update_interval
+        return timedelta(seconds=round(self.adaptive.interval))
+
+    @callback
+    def _async_source_changed(
+        self, entity_id: str, snapshot: SnapshotValue | None
+    ) -> None:
+        """Feed a new source value to the aggregation buffers."""
+        if snapshot is None or snapshot.value is None:
+            return
+
+        for plan_field in self._entity_fields[entity_id]:
+            if (buffer := self._buffers.get(plan_field.field)) is not None:
+                buffer.append(self._convert(plan_field, snapshot))
+
+    @callback
+    def _async_update_interval(self) -> None:
+        """Move the schedule when the adaptive interval changed noticeably."""
+        interval = self.effective_interval.total_seconds()
+        reported = self._reported_interval
+        if abs(interval - reported) > reported * ADAPTIVE_RESCHEDULE_RATIO:
+            self._reported_interval = interval
+            self._interval_callback(self.sensor_id)
+
+    @callback
+    def _async_seed_buffer(self, plan_field: PlanField) -> None:
+        """Start a new interval with the value currently held by the source."""
+        buffer = self._buffers[plan_field.field]
+        buffer.clear()
+
+        snapshot = self._snapshot.get(plan_field.entity_id)
+        if snapshot is not None and snapshot.value is not None:
+            buffer.append(self._convert(plan_field, snapshot))
+
+    def _convert(self, plan_field: PlanField, snapshot: SnapshotValue) -> float:
+        """Convert a parsed source value to the unit the API expects."""
+        converter = self.converters.get(
+            plan_field.entity_id, plan_field.measurement, snapshot.unit
+        )
+        return converter(snapshot.value)
+
+    def _source(self, plan_field: PlanField) -> tuple[SnapshotValue | None, bool]:
+        """Return the value of a source and whether it is a held value.
+
+        While a source is unavailable for less than the maximum age, its last
+        usable value is held, so a brief outage does not cost an upload.
+        """
+        snapshot = self._snapshot.get(plan_field.entity_id)
+        if snapshot is None or snapshot.available or not self.hold_max_age:
+            return snapshot, False
+
+        last_good = self._snapshot.get_last_good(plan_field.entity_id)
+        if last_good is None:
+            return snapshot, False
+
+        outage = (dt_util.utcnow() - snapshot.last_updated).total_seconds()
+        if outage >= self.hold_max_age:
+            return snapshot, False
+        return last_good, True
+
+    def _unavailable_entities(self, pin_plan: PinPlan) -> list[str]:
+        """Return the mapped entities of a pin that are unavailable."""
+        unavailable: list[str] = []
+
+        for plan_field in pin_plan.fields:
+            snapshot, _ = self._source(plan_field)
+            if snapshot is None or not snapshot.available:
+                unavailable.append(plan_field.entity_id)
+
+        return unavailable
+
+    def _pin_ready(self, pin_plan: PinPlan, unavailable: list[str]) -> bool:
+        """Return True if a pin can be uploaded with its available entities.
+
+        A pin whose entities are all available is always ready. Otherwise
+        it is sent without the missing values, and skipped when none of its
+        values are available. The API accepts any subset of the fields of a
+        pin, such as PM10 without PM2.5.
+        """
+        group = ("sources", pin_plan.pin)
+        if not unavailable:
+            self._log.clear(group)
+            return True
+
+        if len(unavailable) < len(pin_plan.fields):
+            self.metrics.record_partial(pin_plan.pin)
+            self._log.log(
+                group,
+                "partial",
+                logging.WARNING,
+                "Uploading %s data for %s without unavailable sensors: %s",
+                pin_plan.data_type,
+                self.sensor_id,
+                unavailable,
+            )
+            return True
+
+        self.metrics.record_skipped(pin_plan.pin)
+        self._log.log(
+            group,
+            "unavailable",
+            logging.WARNING,
+            "Skipping %s upload for %s - sensors unavailable: %s",
+            pin_plan.data_type,
+            self.sensor_id,
+            unavailable,
+        )
+        return False
+
+    async def async_run_cycle(self) -> None:
+        """Queue the readings of every pin for upload, one cycle at a time.
+
+        Returns as soon as the payloads are queued with the sender; the
+        status is updated once all of them have been delivered or failed.
+        Triggers arriving while a cycle is in flight, from the scheduler or a
+        manual refresh, collapse into a single follow-up cycle that reads the
+        values current when it starts.
+        """
+        if self._cycle_in_flight:
+            if self._follow_up:
+                self.skipped_triggers += 1
+            else:
+                self._follow_up = True
+                self.merged_triggers += 1
+            _LOGGER.debug(
+                "Upload for %s still in flight, running once more afterwards",
+                self.sensor_id,
+            )
+            return
+
+        self._cycle_in_flight = True
+        queued = False
+        try:
+            queued = await self._async_queue_cycle()
+        finally:
+            # Otherwise the last pin to resolve ends the cycle
+            if not queued:
+                self._async_cycle_done()
+
+    async def _async_queue_cycle(self) -> bool:
+        """Hand the payload of every pin to the sender.
+
+        Returns True if payloads were queued.
+        """
+        started = time.monotonic()
+        try:
+            results: dict[str, tuple[bool, str | None]] = {}
+            payloads: list[tuple[PinPlan, dict[str, Any], bytes]] = []
+            all_unavailable: list[str] = []
+            for pin_plan in self.plan.pins:
+                # Availability is checked per pin, so an unavailable source
+                # only holds back the pin it belongs to
+                unavailable = self._unavailable_entities(pin_plan)
+                all_unavailable.extend(unavailable)
+                if not self._pin_ready(pin_plan, unavailable):
+                    results[pin_plan.data_type] = (
+                        False,
+                        f"Sensors unavailable: {', '.join(unavailable)}",
+                    )
+                    continue
+
+                built = self._build_payload(pin_plan)
+                if built is None:
+                    # Consider it success if nothing to push
+                    results[pin_plan.data_type] = (True, None)
+                else:
+                    payloads.append((pin_plan, *built))
+
+            self.health.record_sources(all_unavailable)
+            if self.adaptive is not None:
+                self._async_update_interval()
+            if not payloads:
+                self._async_finish_cycle(results)
+                return False
+
+            # Pins are sent concurrently by the workers, so a cycle only
+            # takes as long as the slowest request
+            for pin_plan, payload, body in payloads:
+                future: asyncio.Future[PushResult]
+                if self._outbox.pending(self.sensor_id, pin_plan.pin):
+                    future = self.entry.async_create_background_task(
+                        self.hass,
+                        self._async_replay_and_push(pin_plan, body),
+                        name=f"{DOMAIN} outbox replay {self.sensor_id}",
+                    )
+                else:
+                    future = await self._sender.async_submit(pin_plan.headers, body)
+                self._pending.add(future)
+                future.add_done_callback(
+                    partial(
+                        self._async_pin_done,
+                        pin_plan,
+                        payload,
+                        len(body),
+                        results,
+                        len(self.plan.pins),
+                        started,
+                    )
+                )
+
+        except Exception as err:
+            self.last_error = str(err)
+            # Only the first error of each type comes with a traceback
+            self._log.log(
+                "cycle",
+                type(err).__name__,
+                logging.ERROR,
+                "Error pushing data for %s to Sensor.Community: %s",
+                self.sensor_id,
+                err,
+                exc_info=err,
+            )
+            self._status_callback(self.sensor_id)
+            return False
+
+        self._log.clear("cycle")
+        return True
+
+    @callback
+    def _async_pin_done(
+        self,
+        pin_plan: PinPlan,
+        payload: dict[str, Any],
+        body_size: int,
+        results: dict[str, tuple[bool, str | None]],
+        expected: int,
+        started: float,
+        future: asyncio.Future[PushResult],
+    ) -> None:
+        """Record the outcome of a pin and finish the cycle after the last."""
+        self._pending.discard(future)
+        if future.cancelled():
+            return
+
+        total = time.monotonic() - started
+        if (err := future.exception()) is not None:
+            self._log.log(
+                pin_plan.pin,
+                "internal",
+                logging.ERROR,
+                "Unexpected error pushing %s data for %s: %s",
+                pin_plan.data_type,
+                self.sensor_id,
+                err,
+            )
+            self.metrics.record_push(pin_plan.pin, "internal")
+            result = PushResult(success=False, error=str(err))
+            results[pin_plan.data_type] = (False, str(err))
+        else:
+            result = future.result()
+            self.metrics.record(PHASE_QUEUE_WAIT, result.queue_wait)
+            self.metrics.record(PHASE_NETWORK, result.network)
+            self.metrics.record(PHASE_TOTAL, total)
+
+            success, error, transient = self._handle_result(pin_plan, result)
+            if success:
+                # Anything still queued is older than the reading just sent
+                if dropped := self._outbox.async_discard(self.sensor_id, pin_plan.pin):
+                    _LOGGER.debug(
+                        "Dropped %d queued %s reading(s) of %s, superseded",
+                        dropped,
+                        pin_plan.data_type,
+                        self.sensor_id,
+                    )
+            elif transient and self.outbox_max_age:
+                # Keep the reading so it can be replayed before the next one
+                self._outbox.async_enqueue(self.sensor_id, pin_plan.pin, payload)
+            results[pin_plan.data_type] = (success, error)
+
+        if self.request_log is not None:
+            self.request_log.add(
+                RequestRecord(
+                    time=datetime.now(),
+                    pin=pin_plan.pin,
+                    headers=pin_plan.headers,
+                    payload=payload,
+                    body_size=body_size,
+                    success=result.success,
+                    status=result.status,
+                    error=result.error,
+                    attempts=result.attempts,
+                    queue_wait=result.queue_wait,
+                    network=result.network,
+                    total=total,
+                )
+            )
+
+        if len(results) == expected:
+            self._async_finish_cycle(results)
+            self._async_cycle_done()
+
+    @callback
+    def _async_cycle_done(self) -> None:
+        """End the cycle in flight and start a merged follow-up, if any."""
+        self._cycle_in_flight = False
+        if not self._follow_up:
+            return
+
+        self._follow_up = False
+        self._follow_up_task = self.entry.async_create_background_task(
+            self.hass,
+            self.async_run_cycle(),
+            name=f"{DOMAIN} follow-up upload {self.sensor_id}",
+        )
+
+    @callback
+    def _async_finish_cycle(self, results: dict[str, tuple[bool, str | None]]) -> None:
+        """Update the status from the outcome of every pin."""
+        if all(success for success, _ in results.values()):
+            self.last_upload = datetime.now()
+            self.upload_count += 1
+            self.last_error = None
+        else:
+            error_msgs = [
+                f"{data_type.upper()}: {response or 'Unknown error'}"
+                for data_type, (success, response) in results.items()
+                if not success
+            ]
+            self.last_error = "; ".join(error_msgs) if error_msgs else None
+
+        self.health.async_evaluate(self._transport.circuit_breaker())
+        self._status_callback(self.sensor_id)
+
+    def _build_payload(
+        self, pin_plan: PinPlan
+    ) -> tuple[dict[str, Any], bytes] | None:
+        """Build the payload of a pin and its encoded request body.
+
+        Returns None if there is nothing to push.
+        """
+        data_type = pin_plan.data_type
+
+        # Collect sensor values
+        sensor_values = self._collect_sensor_data(pin_plan)
+
+        if not sensor_values:
+            _LOGGER.debug("No sensor values to push for %s", data_type)
+            return None
+
+        started = time.monotonic()
+        payload = pin_plan.build_payload(sensor_values)
+        body = json_bytes(payload)
+        self.metrics.record(PHASE_SERIALIZE, time.monotonic() - started)
+
+        if self.debug_mode:
+            _LOGGER.debug(
+                "Pushing %s data for %s to Sensor.Community: %s",
+                data_type,
+                self.sensor_id,
+                payload,
+            )
+
+        return payload, body
+
+    def _handle_result(
+        self, pin_plan: PinPlan, result: PushResult
+    ) -> tuple[bool, str | None, bool]:
+        """Count and log the outcome of a push.
+
+        Returns a tuple of (success, error, transient), where transient marks
+        failures that are worth replaying later.
+        """
+        data_type = pin_plan.data_type
+        self.metrics.record_push(pin_plan.pin, result.error_class)
+        self.health.record_push(result)
+
+        if result.success:
+            _LOGGER.debug(
+                "Successfully pushed %s data for %s to Sensor.Community",
+                data_type,
+                self.sensor_id,
+            )
+            if pin_plan.pin in self._log:
+                suppressed = self._log.clear(pin_plan.pin)
+                _LOGGER.info(
+                    "Pushing %s data for %s recovered after %d suppressed error(s)",
+                    data_type,
+                    self.sensor_id,
+                    suppressed,
+                )
+            return True, None, False
+
+        error_class = result.error_class or "unknown"
+        if result.short_circuited:
+            # The breaker logs the outage once for all stations
+            _LOGGER.debug("Skipped pushing %s data: %s", data_type, result.error)
+        elif result.status is not None:
+            self._log.log(
+                pin_plan.pin,
+                error_class,
+                logging.ERROR,
+                "Failed to push %s data for %s after %d attempt(s): %s",
+                data_type,
+                self.sensor_id,
+                result.attempts,
+                result.error,
+            )
+        elif result.error == ERROR_TIMEOUT:
+            self._log.log(
+                pin_plan.pin,
+                error_class,
+                logging.ERROR,
+                "Timeout pushing %s data for %s to Sensor.Community while %s",
+                data_type,
+                self.sensor_id,
+                result.stage,
+            )
+        else:
+            self._log.log(
+                pin_plan.pin,
+                error_class,
+                logging.ERROR,
+                "Network error pushing %s data for %s: %s",
+                data_type,
+                self.sensor_id,
+                result.error,
+            )
+
+        return result.success, result.error, result.transient
+
+    async def _async_replay_and_push(
+        self, pin_plan: PinPlan, body: bytes
+    ) -> PushResult:
+        """Replay the queued readings of a pin, then push the current reading.
+
+        The API stamps readings on arrival, so queued readings are only sent
+        ahead of a newer one and only while they are younger than the outbox
+        maximum age; older readings are dropped rather than published as
+        current. Replays share the rate limit of the pin and are not retried.
+        """
+        pin = pin_plan.pin
+        expired = self._outbox.async_expire(self.sensor_id, pin, self.outbox_max_age)
+        if expired:
+            _LOGGER.debug(
+                "Dropped %d queued %s reading(s) of %s, too old to replay",
+                expired,
+                pin_plan.data_type,
+                self.sensor_id,
+            )
+
+        for _ in range(OUTBOX_DRAIN_BATCH):
+            item = self._outbox.peek(self.sensor_id, pin)
+            if item is None:
+                break
+
+            future = await self._sender.async_submit(
+                pin_plan.headers,
+                json_bytes(item["payload"]),
+                retry=False,
+                merge=False,
+            )
+            success, _, transient = self._handle_result(pin_plan, await future)
+            if not success and transient:
+                # Still unreachable; the current reading queues up behind it
+                break
+
+            # Delivered, or rejected by the API and not worth retrying
+            self._outbox.async_pop(self.sensor_id, pin)
+
+        return await (await self._sender.async_submit(pin_plan.headers, body))
+
+    def _collect_sensor_data(self, pin_plan: PinPlan) -> list[dict[str, str]]:
+        """Collect sensor data values for the fields of a pin."""
+        values: list[dict[str, str]] = []
+        started = time.monotonic()
+        converting = 0.0
+
+        for plan_field in pin_plan.fields:
+            # Values are parsed once per state change by the snapshot cache
+            snapshot, held = self._source(plan_field)
+            if snapshot is None or snapshot.value is None:
+                _LOGGER.debug(
+                    "Skipping %s: state is %s",
+                    plan_field.entity_id,
+                    snapshot.state if snapshot else None,
+                )
+                continue
+
+            convert_started = time.monotonic()
+            buffer = self._buffers.get(plan_field.field)
+            if buffer:
+                # Summarize the interval and start the next one
+                value = AGGREGATORS[self.aggregation](buffer.values())
+                self._async_seed_buffer(plan_field)
+            else:
+                # Apply unit conversions
+                value = self._convert(plan_field, snapshot)
+                if held:
+                    self.metrics.record_held(plan_field.field)
+            converting += time.monotonic() - convert_started
+
+            # One sample per upload, including uploads of an unchanged value,
+            # so the statistics decay on a calm signal
+            if self.adaptive is not None and not held:
+                self.adaptive.add(plan_field.field, plan_field.measurement, value)
+
+            values.append({
+                "value_type": plan_field.value_type,
+                "value": f"{value:.2f}",
+            })
+
+        self.metrics.record(PHASE_CONVERT, converting)
+        self.metrics.record(PHASE_COLLECT, time.monotonic() - started - converting)
+        return values
+
+    def queued_readings(self, pin: int | None = None) -> int:
+        """Return the number of readings in the outbox, for all pins or one."""
+        return self._outbox.pending(self.sensor_id, pin)
+
+    def status_data(self) -> dict[str, Any]:
+        """Get status data for the station."""
+        data: dict[str, Any] = {
+            "last_upload": self.last_upload.isoformat() if self.last_upload else None,
+            "last_error": self.last_error,
+            "upload_count": self.upload_count,
+            "next_upload": self.next_upload.isoformat() if self.next_upload else None,
+            "sensor_id": self.sensor_id,
+            "effective_interval": self.effective_interval.total_seconds(),
+            "queued_readings": self.queued_readings(),
+            "circuit_state": self._transport.circuit_breaker().state,
+            "merged_triggers": self.merged_triggers,
+            "skipped_triggers": self.skipped_triggers,
+        }
+
+        return data
+
+    @callback
+    def async_close(self) -> None:
+        """Stop background work and release the tracked entities.
+
+        Readings still queued in the outbox stay on disk and are replayed
+        after the next setup, unless they are too old by then.
+        """
+        for future in list(self._pending):
+            future.cancel()
+        if self._follow_up_task is not None:
+            self._follow_up_task.cancel()
+        if self._remove_source_listener:
+            self._remove_source_listener()
+        self._untrack_entities()
+        self.health.async_clear()
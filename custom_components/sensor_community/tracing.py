@@ -0,0 +1,186 @@
+"""aiohttp request tracing for the shared Sensor.Community session."""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from .metrics import LatencyHistogram
+
+# Stages of a request, as reported when it times out
+STAGE_STARTED = "starting"
+STAGE_QUEUED = "waiting for a pooled connection"
+STAGE_RESOLVING = "resolving the host"
+STAGE_CONNECTING = "connecting"
+STAGE_SENDING = "sending the request"
+STAGE_WAITING = "waiting for the response"
+STAGE_RECEIVING = "reading the response"
+
+
+class RequestTrace:
+    """Timestamps of one request, passed as the aiohttp trace_request_ctx."""
+
+    __slots__ = ("stage", "started", "queued", "resolving", "connecting", "sent")
+
+    def __init__(self) -> None:
+        """Initialize the trace."""
+        self.stage = STAGE_STARTED
+        self.started = 0.0
+        self.queued = 0.0
+        self.resolving = 0.0
+        self.connecting = 0.0
+        self.sent = 0.0
+
+
+def _request_trace(trace_config_ctx: SimpleNamespace) -> RequestTrace | None:
+    """Return the trace of a request sent by the transport."""
+    trace = trace_config_ctx.trace_request_ctx
+    return trace if isinstance(trace, RequestTrace) else None
+
+
+class SessionTracer:
+    """Time DNS, connection and response stages of every request.
+
+    Shows whether pooled connections are reused and where slow or timed out
+    requests spend their time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracer."""
+        self.dns = LatencyHistogram()
+        self.connection_queue = LatencyHistogram()
+        self.connect = LatencyHistogram()
+        self.first_byte = LatencyHistogram()
+
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+
+        config = aiohttp.TraceConfig()
+        config.on_request_start.append(self._async_request_start)
+        config.on_connection_queued_start.append(self._async_queued_start)
+        config.on_connection_queued_end.append(self._async_queued_end)
+        config.on_connection_create_start.append(self._async_create_start)
+        config.on_connection_create_end.append(self._async_create_end)
+        config.on_connection_reuseconn.append(self._async_reuseconn)
+        config.on_dns_resolvehost_start.append(self._async_dns_start)
+        config.on_dns_resolvehost_end.append(self._async_dns_end)
+        config.on_dns_cache_hit.append(self._async_dns_cache_hit)
+        config.on_dns_cache_miss.append(self._async_dns_cache_miss)
+        config.on_request_headers_sent.append(self._async_headers_sent)
+        config.on_request_end.append(self._async_request_end)
+        self.trace_config = config
+
+    async def _async_request_start(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Start timing a request."""
+        if trace := _request_trace(ctx):
+            trace.started = time.monotonic()
+
+    async def _async_queued_start(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Note that the request waits for a free pooled connection."""
+        if trace := _request_trace(ctx):
+            trace.stage = STAGE_QUEUED
+            trace.queued = time.monotonic()
+
+    async def _async_queued_end(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Record the time spent waiting for a pooled connection."""
+        if trace := _request_trace(ctx):
+            self.connection_queue.record(time.monotonic() - trace.queued)
+
+    async def _async_create_start(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Note that a new connection is opened."""
+        self.connections_created += 1
+        if trace := _request_trace(ctx):
+            trace.stage = STAGE_CONNECTING
+            trace.connecting = time.monotonic()
+
+    async def _async_create_end(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Record the time to establish a connection, including DNS."""
+        if trace := _request_trace(ctx):
+            trace.stage = STAGE_SENDING
+            self.connect.record(time.monotonic() - trace.connecting)
+
+    async def _async_reuseconn(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a request sent on a kept-alive connection."""
+        self.connections_reused += 1
+        if trace := _request_trace(ctx):
+            trace.stage = STAGE_SENDING
+
+    async def _async_dns_start(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Note that the host is being resolved."""
+        if trace := _request_trace(ctx):
+            trace.stage = STAGE_RESOLVING
+            trace.resolving = time.monotonic()
+
+    async def _async_dns_end(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Record the DNS resolution time."""
+        if trace := _request_trace(ctx):
+            trace.stage = STAGE_CONNECTING
+            self.dns.record(time.monotonic() - trace.resolving)
+
+    async def _async_dns_cache_hit(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a host resolved from the DNS cache."""
+        self.dns_cache_hits += 1
+
+    async def _async_dns_cache_miss(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a host that had to be resolved."""
+        self.dns_cache_misses += 1
+
+    async def _async_headers_sent(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Note that the request was sent."""
+        if trace := _request_trace(ctx):
+            trace.stage = STAGE_WAITING
+            trace.sent = time.monotonic()
+
+    async def _async_request_end(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        """Record the time from sending the request to the response headers."""
+        if trace := _request_trace(ctx):
+            trace.stage = STAGE_RECEIVING
+            self.first_byte.record(time.monotonic() - (trace.sent or trace.started))
+
+    @property
+    def reuse_ratio(self) -> float | None:
+        """Return the share of requests sent on a kept-alive connection."""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the request statistics for diagnostics."""
+        return {
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": self.reuse_ratio,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "dns": self.dns.as_dict(),
+            "connection_queue": self.connection_queue.as_dict(),
+            "connect": self.connect.as_dict(),
+            "first_byte": self.first_byte.as_dict(),
+        }
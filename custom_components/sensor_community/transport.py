@@ -0,0 +1,349 @@
+"""Shared HTTP transport for the Sensor.Community integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import time
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    API_URL,
+    DEFAULT_CIRCUIT_FAILURE_RATIO,
+    DEFAULT_CIRCUIT_MIN_REQUESTS,
+    DEFAULT_CIRCUIT_OPEN_DURATION,
+    DEFAULT_MAX_IN_FLIGHT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_TIMEOUT,
+    RETRY_AFTER_MAX,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+)
+from .rate_limit import TokenBucket
+from .tracing import RequestTrace, SessionTracer
+
+_LOGGER = logging.getLogger(__name__)
+
+ERROR_CIRCUIT_OPEN = "Circuit open, API unreachable"
+ERROR_TIMEOUT = "Request timeout"
+
+# Statuses that indicate a temporary problem on the server side
+TRANSIENT_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass(slots=True)
+class PushResult:
+    """Outcome of pushing one payload to the API."""
+
+    success: bool
+    error: str | None = None
+    status: int | None = None
+    transient: bool = False
+    attempts: int = 1
+    short_circuited: bool = False
+    # Seconds spent on HTTP requests, and waiting for a sender worker
+    network: float = 0.0
+    queue_wait: float = 0.0
+    # Stage a timed out request was in
+    stage: str | None = None
+
+    @property
+    def error_class(self) -> str | None:
+        """Return a coarse classification of a failure for metrics."""
+        if self.success:
+            return None
+        if self.short_circuited:
+            return "circuit_open"
+        if self.status is not None:
+            return "http_5xx" if self.status >= 500 else "http_4xx"
+        if self.error == ERROR_TIMEOUT:
+            return "timeout"
+        return "network"
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Bounded exponential backoff with full jitter."""
+
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+    max_retry_after: float = RETRY_AFTER_MAX
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Return the delay before the next attempt, or None to give up.
+
+        Full jitter spreads retries from many stations over the whole backoff
+        window so they do not hit the API in lockstep. A server supplied
+        Retry-After is honoured, unless it exceeds the retry budget.
+        """
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after + random.uniform(0, self.base_delay)
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class SensorCommunityTransport:
+    """Pooled HTTP transport shared by all Sensor.Community config entries.
+
+    A single connector keeps connections to the API alive between stations,
+    so uploads from many entries reuse the same sockets. The transport is
+    reference counted; the session is only closed when the last entry
+    releases it. At most max_in_flight requests are sent at the same time,
+    however many stations are due; waiting for backoff does not hold a slot.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        retry_policy: RetryPolicy | None = None,
+        circuit_failure_ratio: float = DEFAULT_CIRCUIT_FAILURE_RATIO,
+        circuit_min_requests: int = DEFAULT_CIRCUIT_MIN_REQUESTS,
+        circuit_open_duration: float = DEFAULT_CIRCUIT_OPEN_DURATION,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> None:
+        """Initialize the transport."""
+        self.hass = hass
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._session: aiohttp.ClientSession | None = None
+        self._refs = 0
+        self.tracer = SessionTracer()
+
+        self._circuit_failure_ratio = circuit_failure_ratio
+        self._circuit_min_requests = circuit_min_requests
+        self._circuit_open_duration = circuit_open_duration
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+
+    @property
+    def refs(self) -> int:
+        """Return the number of config entries using the transport."""
+        return self._refs
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the shared client session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                use_dns_cache=True,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, trace_configs=[self.tracer.trace_config]
+            )
+            _LOGGER.debug("Created shared Sensor.Community HTTP session")
+        return self._session
+
+    def circuit_breaker(self, endpoint: str = API_URL) -> CircuitBreaker:
+        """Return the circuit breaker for an endpoint."""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(
+                endpoint,
+                failure_ratio=self._circuit_failure_ratio,
+                min_requests=self._circuit_min_requests,
+                open_duration=self._circuit_open_duration,
+            )
+        return breaker
+
+    def acquire(self) -> None:
+        """Register a config entry as a user of the transport."""
+        self._refs += 1
+
+    async def async_release(self) -> bool:
+        """Release a reference and close the session when unused.
+
+        Returns True if this was the last reference.
+        """
+        self._refs = max(self._refs - 1, 0)
+        if self._refs:
+            return False
+
+        await self.async_close()
+        return True
+
+    async def async_close(self) -> None:
+        """Close the shared session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            _LOGGER.debug("Closed shared Sensor.Community HTTP session")
+
+    async def async_push(
+        self,
+        headers: Mapping[str, str],
+        payload: bytes,
+        retry: bool = True,
+        rate_limit: TokenBucket | None = None,
+    ) -> PushResult:
+        """Push a payload to the API, retrying transient failures.
+
+        Requests are refused without touching the network while the circuit
+        breaker for the endpoint is open. Each retry takes a token from the
+        rate_limit bucket of the sensor ID and pin, and is skipped when the
+        bucket is empty.
+        """
+        breaker = self.circuit_breaker(API_URL)
+        max_attempts = self.retry_policy.max_attempts if retry else 1
+        result = PushResult(
+            False, ERROR_CIRCUIT_OPEN, transient=True, attempts=0, short_circuited=True
+        )
+        attempt = 0
+        network = 0.0
+
+        while True:
+            if not breaker.allow_request():
+                return result
+
+            attempt += 1
+            try:
+                result, retry_after = await self._async_post(headers, payload)
+            except BaseException:
+                # Cancelled, or failed in a way that says nothing about the
+                # endpoint; either way the probe must not stay claimed
+                breaker.release_probe()
+                raise
+            result.attempts = attempt
+            network += result.network
+            result.network = network
+
+            # Only timeouts, network and server errors count as failures. Other
+            # rejects still prove the endpoint is up, and a 429 only means
+            # this sensor is sending too often, so it says nothing either way
+            if result.status == 429:
+                breaker.release_probe()
+            elif result.error_class in ("http_5xx", "timeout", "network"):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if result.success or not result.transient or attempt >= max_attempts:
+                return result
+
+            delay = self.retry_policy.delay(attempt, retry_after)
+            if delay is None:
+                _LOGGER.debug(
+                    "Not retrying %s: Retry-After of %.0f seconds is too long",
+                    headers.get("X-Sensor"),
+                    retry_after,
+                )
+                return result
+
+            if rate_limit is not None and not rate_limit.try_acquire():
+                rate_limit.skipped_retries += 1
+                _LOGGER.debug(
+                    "Not retrying %s pin %s: rate limit reached",
+                    headers.get("X-Sensor"),
+                    headers.get("X-Pin"),
+                )
+                return result
+
+            _LOGGER.debug(
+                "Retrying push for %s pin %s in %.1f seconds (attempt %d): %s",
+                headers.get("X-Sensor"),
+                headers.get("X-Pin"),
+                delay,
+                attempt,
+                result.error,
+            )
+            await asyncio.sleep(delay)
+
+    async def _async_post(
+        self, headers: Mapping[str, str], payload: bytes
+    ) -> tuple[PushResult, float | None]:
+        """Perform a single POST and classify the outcome.
+
+        Returns the result and the Retry-After delay, if the server sent one.
+        """
+        async with self._slots:
+            self.in_flight += 1
+            started = time.monotonic()
+            try:
+                result, retry_after = await self._async_send(headers, payload)
+            finally:
+                self.in_flight -= 1
+        result.network = time.monotonic() - started
+        return result, retry_after
+
+    async def _async_send(
+        self, headers: Mapping[str, str], payload: bytes
+    ) -> tuple[PushResult, float | None]:
+        """Send a request while holding an in-flight slot."""
+        trace = RequestTrace()
+        try:
+            async with asyncio.timeout(HTTP_TIMEOUT):
+                async with self.session.post(
+                    API_URL,
+                    data=payload,
+                    headers=headers,
+                    trace_request_ctx=trace,
+                ) as response:
+                    if response.status in (200, 201):
+                        return PushResult(True, status=response.status), None
+
+                    error_text = await response.text()
+                    retry_after = None
+                    if response.status in (429, 503):
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                    return (
+                        PushResult(
+                            False,
+                            f"HTTP {response.status}: {error_text}",
+                            status=response.status,
+                            transient=(
+                                response.status in TRANSIENT_STATUSES
+                                or response.status >= 500
+                            ),
+                        ),
+                        retry_after,
+                    )
+
+        except asyncio.TimeoutError:
+            return (
+                PushResult(False, ERROR_TIMEOUT, transient=True, stage=trace.stage),
+                None,
+            )
+        except aiohttp.ClientError as err:
+            return PushResult(False, str(err) or type(err).__name__, transient=True), None
@@ -0,0 +1,174 @@
+"""Unit conversion for values sent to Sensor.Community."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+
+from homeassistant.const import (
+    CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+    CONCENTRATION_MILLIGRAMS_PER_CUBIC_METER,
+    PERCENTAGE,
+    UnitOfPressure,
+    UnitOfTemperature,
+)
+from homeassistant.util.unit_conversion import PressureConverter, TemperatureConverter
+
+from .const import (
+    CONF_SENSOR_HUMIDITY,
+    CONF_SENSOR_PM10,
+    CONF_SENSOR_PM25,
+    CONF_SENSOR_PRESSURE,
+    CONF_SENSOR_TEMPERATURE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Measurements and the unit the API expects for each
+MEASUREMENT_PM = "pm"  # µg/m³
+MEASUREMENT_TEMPERATURE = "temperature"  # °C
+MEASUREMENT_HUMIDITY = "humidity"  # %
+MEASUREMENT_PRESSURE = "pressure"  # Pa
+
+FIELD_MEASUREMENTS: dict[str, str] = {
+    CONF_SENSOR_PM25: MEASUREMENT_PM,
+    CONF_SENSOR_PM10: MEASUREMENT_PM,
+    CONF_SENSOR_TEMPERATURE: MEASUREMENT_TEMPERATURE,
+    CONF_SENSOR_HUMIDITY: MEASUREMENT_HUMIDITY,
+    CONF_SENSOR_PRESSURE: MEASUREMENT_PRESSURE,
+}
+
+Converter = Callable[[float], float]
+
+
+@dataclass(frozen=True, slots=True)
+class AffineConverter:
+    """Convert a value with precomputed scale and offset."""
+
+    scale: float
+    offset: float = 0.0
+
+    def __call__(self, value: float) -> float:
+        """Convert a value."""
+        return value * self.scale + self.offset
+
+
+IDENTITY = AffineConverter(1.0)
+
+
+def _affine(convert: Callable[[float], float]) -> AffineConverter:
+    """Precompute the factors of a linear unit conversion."""
+    offset = convert(0.0)
+    return AffineConverter(convert(1.0) - offset, offset)
+
+
+def _humidity_fraction_or_percent(value: float) -> float:
+    """Convert a unitless humidity that may be a fraction (0-1) to percent."""
+    if value <= 1:
+        return value * 100
+    return value
+
+
+def _build_registry() -> dict[tuple[str, str], Converter]:
+    """Build the conversion table keyed by (measurement, unit)."""
+    registry: dict[tuple[str, str], Converter] = {}
+
+    for unit in TemperatureConverter.VALID_UNITS:
+        registry[(MEASUREMENT_TEMPERATURE, unit)] = _affine(
+            lambda value, unit=unit: TemperatureConverter.convert(
+                value, unit, UnitOfTemperature.CELSIUS
+            )
+        )
+    registry[(MEASUREMENT_TEMPERATURE, "C")] = registry[
+        (MEASUREMENT_TEMPERATURE, UnitOfTemperature.CELSIUS)
+    ]
+    registry[(MEASUREMENT_TEMPERATURE, "F")] = registry[
+        (MEASUREMENT_TEMPERATURE, UnitOfTemperature.FAHRENHEIT)
+    ]
+    registry[(MEASUREMENT_TEMPERATURE, "")] = IDENTITY
+
+    for unit in PressureConverter.VALID_UNITS:
+        registry[(MEASUREMENT_PRESSURE, unit)] = _affine(
+            lambda value, unit=unit: PressureConverter.convert(
+                value, unit, UnitOfPressure.PA
+            )
+        )
+    # Pressure sensors without a unit are assumed to report hPa
+    registry[(MEASUREMENT_PRESSURE, "")] = registry[
+        (MEASUREMENT_PRESSURE, UnitOfPressure.HPA)
+    ]
+
+    registry[(MEASUREMENT_HUMIDITY, PERCENTAGE)] = IDENTITY
+    registry[(MEASUREMENT_HUMIDITY, "")] = _humidity_fraction_or_percent
+
+    for unit in (
+        CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+        "μg/m³",  # Greek mu instead of the micro sign
+        "ug/m³",
+        "ug/m3",
+        "",
+    ):
+        registry[(MEASUREMENT_PM, unit)] = IDENTITY
+    for unit in (CONCENTRATION_MILLIGRAMS_PER_CUBIC_METER, "mg/m3"):
+        registry[(MEASUREMENT_PM, unit)] = AffineConverter(1000.0)
+
+    return registry
+
+
+CONVERTERS = _build_registry()
+
+
+def get_converter(measurement: str, unit: str | None) -> Converter:
+    """Return the converter for a measurement reported in a unit."""
+    converter = CONVERTERS.get((measurement, unit or ""))
+    if converter is None:
+        _LOGGER.warning(
+            "Unsupported unit %r for %s, sending values unconverted",
+            unit,
+            measurement,
+        )
+        return IDENTITY
+    return converter
+
+
+def describe_converter(converter: Converter) -> str:
+    """Return a short description of a converter for diagnostics."""
+    if isinstance(converter, AffineConverter):
+        return f"x * {converter.scale:g} + {converter.offset:g}"
+    return getattr(converter, "__name__", repr(converter))
+
+
+class ConverterCache:
+    """Converter chosen per entity, replaced only when its unit changes."""
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._cache: dict[str, tuple[str, str | None, Converter]] = {}
+
+    def get(self, entity_id: str, measurement: str, unit: str | None) -> Converter:
+        """Return the converter for an entity's current unit."""
+        cached = self._cache.get(entity_id)
+        if cached is not None and cached[1] == unit and cached[0] == measurement:
+            return cached[2]
+
+        converter = get_converter(measurement, unit)
+        self._cache[entity_id] = (measurement, unit, converter)
+        _LOGGER.debug(
+            "Using conversion %s for %s (%s in %r)",
+            describe_converter(converter),
+            entity_id,
+            measurement,
+            unit,
+        )
+        return converter
+
+    def as_dict(self) -> dict[str, dict[str, str | None]]:
+        """Return the active converters for diagnostics."""
+        return {
+            entity_id: {
+                "measurement": measurement,
+                "unit": unit,
+                "conversion": describe_converter(converter),
+            }
+            for entity_id, (measurement, unit, converter) in self._cache.items()
+        }
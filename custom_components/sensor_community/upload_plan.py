@@ -0,0 +1,133 @@
+"""Compiled upload plan for a Sensor.Community station."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from .const import (
+    ENV_SENSORS,
+    PIN_ENV,
+    PIN_PM,
+    PM_SENSORS,
+    SOFTWARE_TYPE,
+    VALUE_TYPE_MAP,
+)
+from .units import FIELD_MEASUREMENTS
+
+SOFTWARE_VERSION = f"{SOFTWARE_TYPE}-1.0.0"
+USER_AGENT = f"{SOFTWARE_TYPE}/1.0.0"
+
+# Pins in upload order: (X-Pin, data type used in logs and status, fields)
+PIN_GROUPS: tuple[tuple[int, str, list[str]], ...] = (
+    (PIN_PM, "pm", PM_SENSORS),
+    (PIN_ENV, "env", ENV_SENSORS),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PlanField:
+    """A mapped source entity and how its value is sent."""
+
+    field: str
+    entity_id: str
+    value_type: str
+    pin: int
+    measurement: str
+
+
+@dataclass(frozen=True, slots=True)
+class PinPlan:
+    """Everything needed to upload one pin, resolved ahead of time."""
+
+    pin: int
+    data_type: str
+    fields: tuple[PlanField, ...]
+    headers: Mapping[str, str]
+
+    def build_payload(self, values: list[dict[str, str]]) -> dict[str, Any]:
+        """Return the request payload for the collected values."""
+        return {"software_version": SOFTWARE_VERSION, "sensordatavalues": values}
+
+
+@dataclass(frozen=True, slots=True)
+class UploadPlan:
+    """Immutable upload plan, built once per setup or options change."""
+
+    sensor_id: str
+    fields: tuple[PlanField, ...]
+    pins: tuple[PinPlan, ...]
+
+    @property
+    def entity_ids(self) -> tuple[str, ...]:
+        """Return the mapped entity IDs."""
+        return tuple(plan_field.entity_id for plan_field in self.fields)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a representation for diagnostics."""
+        return {
+            "sensor_id": self.sensor_id,
+            "pins": [
+                {
+                    "pin": pin_plan.pin,
+                    "data_type": pin_plan.data_type,
+                    "headers": dict(pin_plan.headers),
+                    "fields": [
+                        {
+                            "field": plan_field.field,
+                            "entity_id": plan_field.entity_id,
+                            "value_type": plan_field.value_type,
+                            "measurement": plan_field.measurement,
+                        }
+                        for plan_field in pin_plan.fields
+                    ],
+                }
+                for pin_plan in self.pins
+            ],
+        }
+
+
+def build_headers(sensor_id: str, pin: int) -> Mapping[str, str]:
+    """Return the read-only request headers for a sensor ID and pin."""
+    return MappingProxyType(
+        {
+            "Content-Type": "application/json",
+            "X-Pin": str(pin),
+            "X-Sensor": sensor_id,
+            "User-Agent": USER_AGENT,
+        }
+    )
+
+
+def build_upload_plan(sensor_id: str, config: Mapping[str, Any]) -> UploadPlan:
+    """Compile the upload plan from a merged entry configuration."""
+    fields: list[PlanField] = []
+    pins: list[PinPlan] = []
+
+    for pin, data_type, group in PIN_GROUPS:
+        pin_fields = tuple(
+            PlanField(
+                field=field,
+                entity_id=entity_id,
+                value_type=VALUE_TYPE_MAP[field],
+                pin=pin,
+                measurement=FIELD_MEASUREMENTS[field],
+            )
+            for field in group
+            if (entity_id := config.get(field))
+        )
+        if not pin_fields:
+            continue
+
+        fields.extend(pin_fields)
+        pins.append(
+            PinPlan(
+                pin=pin,
+                data_type=data_type,
+                fields=pin_fields,
+                headers=build_headers(sensor_id, pin),
+            )
+        )
+
+    return UploadPlan(sensor_id=sensor_id, fields=tuple(fields), pins=tuple(pins))
@@ -0,0 +1 @@
+"""Tests for the Sensor.Community integration."""
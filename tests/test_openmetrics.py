@@ -0,0 +1,138 @@
+"""Tests for the OpenMetrics exposition of the Sensor.Community integration."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.sensor_community.circuit_breaker import (  # noqa: E402
+    CircuitBreaker,
+)
+from custom_components.sensor_community.const import (  # noqa: E402
+    API_URL,
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    DATA_TRANSPORT,
+    DOMAIN,
+    PIN_PM,
+)
+from custom_components.sensor_community.coordinator import (  # noqa: E402
+    SensorCommunityCoordinator,
+)
+from custom_components.sensor_community.metrics import (  # noqa: E402
+    PHASE_NETWORK,
+    UploadMetrics,
+)
+from custom_components.sensor_community.openmetrics import (  # noqa: E402
+    OpenMetricsRenderer,
+)
+
+SENSOR_ID = "esp8266-12345678"
+LATENCY = "sensor_community_upload_latency_seconds"
+
+
+class FakeStation:
+    """Station with metrics and an empty outbox."""
+
+    def __init__(self, sensor_id: str = SENSOR_ID) -> None:
+        """Initialize the station."""
+        self.sensor_id = sensor_id
+        self.metrics = UploadMetrics()
+        self.plan = SimpleNamespace(pins=[SimpleNamespace(pin=PIN_PM)])
+
+    def queued_readings(self, pin: int | None = None) -> int:
+        """Return the number of queued readings."""
+        return 0
+
+
+def _renderer(
+    station: FakeStation, breaker: CircuitBreaker | None = None
+) -> OpenMetricsRenderer:
+    """Return a renderer for a single station."""
+    coordinator = MagicMock(spec=SensorCommunityCoordinator)
+    coordinator.stations = {station.sensor_id: station}
+    transport = MagicMock(in_flight=0)
+    transport.circuit_breaker.return_value = breaker or CircuitBreaker(API_URL)
+    hass = SimpleNamespace(
+        data={DOMAIN: {"entry_id": coordinator, DATA_TRANSPORT: transport}}
+    )
+    return OpenMetricsRenderer(hass)
+
+
+def _samples(text: str) -> dict[str, str]:
+    """Return the value of every sample by name and labels."""
+    return dict(
+        line.rsplit(" ", 1)
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    )
+
+
+def test_histogram_inf_bucket_matches_count() -> None:
+    """Test the +Inf bucket holds every sample, also those above the bounds."""
+    station = FakeStation()
+    for seconds in (0.001, 0.2, 0.2, 1000.0):
+        station.metrics.record(PHASE_NETWORK, seconds)
+
+    text = _renderer(station).render()
+    samples = _samples(text)
+    labels = f'sensor_id="{SENSOR_ID}",phase="{PHASE_NETWORK}"'
+
+    assert samples[f'{LATENCY}_bucket{{{labels},le="+Inf"}}'] == "4"
+    assert samples[f"{LATENCY}_count{{{labels}}}"] == "4"
+    buckets = [
+        int(value)
+        for name, value in samples.items()
+        if name.startswith(f"{LATENCY}_bucket{{{labels},")
+    ]
+    assert buckets == sorted(buckets)
+    assert buckets[-2] == 3
+    assert text.endswith("# EOF\n")
+
+
+def test_circuit_state_is_a_stateset() -> None:
+    """Test exactly the current state of the breaker is set."""
+    breaker = CircuitBreaker(API_URL, min_requests=1)
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+
+    text = _renderer(FakeStation(), breaker).render()
+    samples = _samples(text)
+
+    assert "# TYPE sensor_community_circuit_state stateset\n" in text
+    name = "sensor_community_circuit_state"
+    assert {
+        state: samples[f'{name}{{{name}="{state}"}}']
+        for state in (CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN)
+    } == {CIRCUIT_CLOSED: "0", CIRCUIT_OPEN: "1", CIRCUIT_HALF_OPEN: "0"}
+
+
+def test_cached_station_is_rendered_again_after_an_update() -> None:
+    """Test the cache follows the metrics version and the metrics object."""
+    station = FakeStation()
+    renderer = _renderer(station)
+    uploads = (
+        f'sensor_community_uploads_total{{sensor_id="{SENSOR_ID}",pin="{PIN_PM}"}}'
+    )
+    timeouts = (
+        f'sensor_community_upload_errors_total{{sensor_id="{SENSOR_ID}",'
+        f'pin="{PIN_PM}",class="timeout"}}'
+    )
+
+    station.metrics.record_push(PIN_PM, None)
+    assert _samples(renderer.render())[uploads] == "1"
+
+    station.metrics.record_push(PIN_PM, None)
+    assert _samples(renderer.render())[uploads] == "2"
+
+    # A reload starts new metrics, which may reach the cached version again
+    station.metrics = UploadMetrics()
+    station.metrics.record_push(PIN_PM, "timeout")
+    station.metrics.record_push(PIN_PM, "timeout")
+    samples = _samples(renderer.render())
+    assert uploads not in samples
+    assert samples[timeouts] == "2"
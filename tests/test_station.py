@@ -0,0 +1,277 @@
+"""Tests for the upload cycle of a Sensor.Community station."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import json
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.sensor_community import outbox as outbox_module  # noqa: E402
+from custom_components.sensor_community.const import (  # noqa: E402
+    CONF_HOLD_MAX_AGE,
+    CONF_OUTBOX_MAX_AGE,
+    CONF_SENSOR_HUMIDITY,
+    CONF_SENSOR_ID,
+    CONF_SENSOR_PM10,
+    CONF_SENSOR_PM25,
+    CONF_SENSOR_TEMPERATURE,
+    PIN_ENV,
+    PIN_PM,
+)
+from custom_components.sensor_community.outbox import (  # noqa: E402
+    SensorCommunityOutbox,
+)
+from custom_components.sensor_community.snapshot import SnapshotValue  # noqa: E402
+from custom_components.sensor_community.station import StationUploader  # noqa: E402
+from custom_components.sensor_community.transport import PushResult  # noqa: E402
+
+SENSOR_ID = "esp8266-12345678"
+CONFIG = {
+    CONF_SENSOR_ID: SENSOR_ID,
+    CONF_SENSOR_PM25: "sensor.pm25",
+    CONF_SENSOR_PM10: "sensor.pm10",
+    CONF_SENSOR_TEMPERATURE: "sensor.temperature",
+    CONF_SENSOR_HUMIDITY: "sensor.humidity",
+}
+
+
+class FakeSnapshotCache:
+    """Snapshot cache with fixed values."""
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self.values: dict[str, SnapshotValue] = {}
+        self.last_good: dict[str, SnapshotValue] = {}
+
+    def set(
+        self, entity_id: str, value: float | None, unit: str, **kwargs: Any
+    ) -> None:
+        """Set the current value of an entity."""
+        snapshot = SnapshotValue(
+            value=value,
+            unit=unit,
+            last_updated=kwargs.get("last_updated", dt_util.utcnow()),
+            state="unavailable" if value is None else str(value),
+        )
+        self.values[entity_id] = snapshot
+        if value is not None:
+            self.last_good[entity_id] = snapshot
+
+    def get(self, entity_id: str) -> SnapshotValue | None:
+        """Return the current value of an entity."""
+        return self.values.get(entity_id)
+
+    def get_last_good(self, entity_id: str) -> SnapshotValue | None:
+        """Return the last usable value of an entity."""
+        return self.last_good.get(entity_id)
+
+    def async_track(self, entity_ids: Any) -> Any:
+        """Track entities."""
+        return lambda: None
+
+    def async_add_listener(self, entity_ids: Any, listener: Any) -> Any:
+        """Add a listener."""
+        return lambda: None
+
+
+class FakeSender:
+    """Sender that records submitted payloads.
+
+    Payloads are left pending, or delivered right away with deliver=True.
+    """
+
+    def __init__(self, deliver: bool = False) -> None:
+        """Initialize the sender."""
+        self.transport = MagicMock()
+        self.deliver = deliver
+        self.submitted: dict[int, dict[str, Any]] = {}
+        self.sent: list[tuple[int, dict[str, Any]]] = []
+
+    async def async_submit(self, headers: Any, payload: bytes, **kwargs: Any) -> Any:
+        """Record a payload."""
+        pin = int(headers["X-Pin"])
+        self.submitted[pin] = json.loads(payload)
+        self.sent.append((pin, json.loads(payload)))
+        future = asyncio.get_running_loop().create_future()
+        if self.deliver:
+            future.set_result(PushResult(True, status=201))
+        return future
+
+
+def _run_cycle(
+    snapshot: FakeSnapshotCache,
+    outbox: SensorCommunityOutbox | None = None,
+    sender: FakeSender | None = None,
+    **options: Any,
+) -> tuple[StationUploader, FakeSender]:
+    """Run one upload cycle of a station and wait for its background tasks."""
+    sender = sender or FakeSender()
+    if outbox is None:
+        outbox = _outbox()
+
+    async def _run() -> StationUploader:
+        tasks: list[asyncio.Task[Any]] = []
+
+        def _create_task(hass: Any, coro: Any, name: str) -> asyncio.Task[Any]:
+            tasks.append(asyncio.create_task(coro, name=name))
+            return tasks[-1]
+
+        entry = MagicMock()
+        entry.async_create_background_task.side_effect = _create_task
+        station = StationUploader(
+            MagicMock(),
+            entry,
+            {**CONFIG, **options},
+            timedelta(seconds=150),
+            sender,
+            outbox,
+            snapshot,
+            MagicMock(),
+            MagicMock(),
+        )
+        await station.async_run_cycle()
+        await asyncio.gather(*tasks)
+        return station
+
+    return asyncio.run(_run()), sender
+
+
+def _outbox() -> SensorCommunityOutbox:
+    """Return an empty outbox that is never written to disk."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(outbox_module, "Store", MagicMock())
+        return SensorCommunityOutbox(MagicMock())
+
+
+def _values(payload: dict[str, Any]) -> dict[str, str]:
+    """Return the values of a payload by value type."""
+    return {
+        item["value_type"]: item["value"] for item in payload["sensordatavalues"]
+    }
+
+
+def _available_snapshot() -> FakeSnapshotCache:
+    """Return sources that are all available."""
+    snapshot = FakeSnapshotCache()
+    snapshot.set("sensor.pm25", 12.0, "µg/m³")
+    snapshot.set("sensor.pm10", 20.0, "µg/m³")
+    snapshot.set("sensor.temperature", 21.5, "°C")
+    snapshot.set("sensor.humidity", 55.0, "%")
+    return snapshot
+
+
+def _snapshot_with_unavailable_temperature(**kwargs: Any) -> FakeSnapshotCache:
+    """Return sources where only the temperature is unavailable."""
+    snapshot = FakeSnapshotCache()
+    snapshot.set("sensor.pm25", 12.0, "µg/m³")
+    snapshot.set("sensor.pm10", 20.0, "µg/m³")
+    snapshot.set("sensor.temperature", 21.5, "°C")
+    snapshot.set("sensor.temperature", None, "°C", **kwargs)
+    snapshot.set("sensor.humidity", 55.0, "%")
+    return snapshot
+
+
+def test_unavailable_env_entity_does_not_hold_back_pm() -> None:
+    """Test the PM pin is sent while an environmental entity is unavailable."""
+    station, sender = _run_cycle(_snapshot_with_unavailable_temperature())
+
+    assert set(sender.submitted) == {PIN_PM, PIN_ENV}
+    assert _values(sender.submitted[PIN_PM]) == {"P2": "12.00", "P1": "20.00"}
+    assert _values(sender.submitted[PIN_ENV]) == {"humidity": "55.00"}
+    assert station.metrics.partial == {PIN_ENV: 1}
+    assert station.metrics.skipped == {}
+    assert station.last_error is None
+
+
+def test_pm10_is_sent_without_pm25() -> None:
+    """Test the PM pin is sent with the PM value that is available."""
+    snapshot = FakeSnapshotCache()
+    snapshot.set("sensor.pm25", None, "µg/m³")
+    snapshot.set("sensor.pm10", 20.0, "µg/m³")
+    snapshot.set("sensor.temperature", 21.5, "°C")
+    snapshot.set("sensor.humidity", 55.0, "%")
+
+    station, sender = _run_cycle(snapshot)
+
+    assert set(sender.submitted) == {PIN_PM, PIN_ENV}
+    assert _values(sender.submitted[PIN_PM]) == {"P1": "20.00"}
+    assert station.metrics.partial == {PIN_PM: 1}
+    assert station.metrics.skipped == {}
+
+
+def test_unavailable_pm_entities_skip_only_pm() -> None:
+    """Test the PM pin is skipped when none of its values are available."""
+    snapshot = FakeSnapshotCache()
+    snapshot.set("sensor.pm25", None, "µg/m³")
+    snapshot.set("sensor.pm10", None, "µg/m³")
+    snapshot.set("sensor.temperature", 21.5, "°C")
+    snapshot.set("sensor.humidity", 55.0, "%")
+
+    station, sender = _run_cycle(snapshot)
+
+    assert set(sender.submitted) == {PIN_ENV}
+    assert station.metrics.skipped == {PIN_PM: 1}
+
+
+def test_held_value_is_sent_during_brief_outage() -> None:
+    """Test the last good value is sent while the outage is short."""
+    station, sender = _run_cycle(
+        _snapshot_with_unavailable_temperature(), **{CONF_HOLD_MAX_AGE: 60}
+    )
+
+    assert _values(sender.submitted[PIN_ENV]) == {
+        "temperature": "21.50",
+        "humidity": "55.00",
+    }
+    assert station.metrics.held == {CONF_SENSOR_TEMPERATURE: 1}
+    assert station.metrics.partial == {}
+
+
+def test_held_value_expires_after_maximum_age() -> None:
+    """Test the last good value is dropped once the outage is too long."""
+    snapshot = _snapshot_with_unavailable_temperature(
+        last_updated=dt_util.utcnow() - timedelta(seconds=120)
+    )
+    station, sender = _run_cycle(snapshot, **{CONF_HOLD_MAX_AGE: 60})
+
+    assert _values(sender.submitted[PIN_ENV]) == {"humidity": "55.00"}
+    assert station.metrics.held == {}
+    assert station.metrics.partial == {PIN_ENV: 1}
+
+
+def test_queued_reading_is_replayed_before_the_current_one() -> None:
+    """Test a recent queued reading is sent ahead of the current reading."""
+    outbox = _outbox()
+    outbox.async_enqueue(SENSOR_ID, PIN_PM, {"queued": True})
+
+    _, sender = _run_cycle(_available_snapshot(), outbox, FakeSender(deliver=True))
+
+    pm_sent = [payload for pin, payload in sender.sent if pin == PIN_PM]
+    assert pm_sent[0] == {"queued": True}
+    assert _values(pm_sent[1]) == {"P2": "12.00", "P1": "20.00"}
+    assert outbox.pending(SENSOR_ID) == 0
+
+
+def test_old_queued_reading_is_dropped() -> None:
+    """Test a reading older than the outbox maximum age is never sent."""
+    outbox = _outbox()
+    outbox.async_enqueue(SENSOR_ID, PIN_PM, {"queued": True})
+    outbox.peek(SENSOR_ID, PIN_PM)["queued_at"] = time.time() - 600
+
+    _, sender = _run_cycle(
+        _available_snapshot(),
+        outbox,
+        FakeSender(deliver=True),
+        **{CONF_OUTBOX_MAX_AGE: 300},
+    )
+
+    assert {"queued": True} not in [payload for _, payload in sender.sent]
+    assert outbox.pending(SENSOR_ID) == 0